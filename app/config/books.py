@@ -1,12 +1,10 @@
 from ..database.base import SessionLocal
 from ..repository import user as user_repository
 from ..repository import book as book_repository
+from ..repository import book_availability as book_availability_repository
+from ..repository import suggestion as suggestion_repository
 from ..schemas import book as book_schemas
 import os
-from faker import Faker
-
-
-fake = Faker()
 
 
 class Envs:
@@ -32,27 +30,51 @@ authors = [
 
 
 def create_default_books():
-    default_user = user_repository.get_one_by_email(
-        Envs.DEFAULT_USER_EMAIL, SessionLocal(), True
-    )
-    if default_user is None:
-        return
-    book_count = book_repository.count_all(SessionLocal())
-    if book_count >= 25:
-        return
-    for author in authors:
-        book_repository.create(
-            book_schemas.CreateBook(
-                **{
-                    "title": fake.catch_phrase(),
-                    "author_name": author,
-                    "description": fake.text(max_nb_chars=200),
-                    "img_url": "https://picsum.photos/"
-                    + str(fake.random_int(min=200, max=700)),
-                    "public_shelf_quantity": fake.random_int(min=5, max=300),
-                    "private_shelf_quantity": fake.random_int(min=1, max=10),
-                }
-            ),
-            default_user.id,
-            SessionLocal(),
+    from faker import Faker
+
+    fake = Faker()
+    db = SessionLocal()
+    try:
+        default_user = user_repository.get_one_by_email(
+            Envs.DEFAULT_USER_EMAIL, db, True
         )
+        if default_user is None:
+            return
+        book_count = book_repository.count_all(db)
+        if book_count >= 25:
+            return
+        for author in authors:
+            book_repository.create(
+                book_schemas.CreateBook(
+                    **{
+                        "title": fake.catch_phrase(),
+                        "author_name": author,
+                        "description": fake.text(max_nb_chars=200),
+                        "img_url": "https://picsum.photos/"
+                        + str(fake.random_int(min=200, max=700)),
+                        "public_shelf_quantity": fake.random_int(min=5, max=300),
+                        "private_shelf_quantity": fake.random_int(min=1, max=10),
+                    }
+                ),
+                default_user.id,
+                db,
+            )
+    finally:
+        db.close()
+
+
+def reconcile_book_availability():
+    db = SessionLocal()
+    try:
+        if book_availability_repository.is_empty(db):
+            book_availability_repository.reconcile(db)
+    finally:
+        db.close()
+
+
+def load_suggestion_index():
+    db = SessionLocal()
+    try:
+        suggestion_repository.load_suggestion_index(db)
+    finally:
+        db.close()
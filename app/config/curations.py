@@ -0,0 +1,10 @@
+from ..database.base import SessionLocal
+from ..repository import curation_document as curation_document_repository
+
+
+def render_curation_documents():
+    db = SessionLocal()
+    try:
+        curation_document_repository.render_stale(db)
+    finally:
+        db.close()
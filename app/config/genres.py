@@ -1,10 +1,7 @@
 from ..database.base import SessionLocal
 from ..repository import genre as genre_repository
+from ..repository import genre_association as genre_association_repository
 from ..schemas import genre as genre_schemas
-from faker import Faker
-
-
-fake = Faker()
 
 default_genres = [
     {
@@ -59,11 +56,20 @@ default_genres = [
 
 
 def create_default_genres():
-    genre_count = genre_repository.count_all(SessionLocal())
-    if genre_count >= len(default_genres):
-        return
-    for genre in default_genres:
-        genre_repository.create(
-            genre_schemas.CreateGenre(**genre),
-            SessionLocal(),
-        )
+    db = SessionLocal()
+    try:
+        genre_count = genre_repository.count_all(db)
+        if genre_count >= len(default_genres):
+            return
+        for genre in default_genres:
+            genre_repository.create(genre_schemas.CreateGenre(**genre), db)
+    finally:
+        db.close()
+
+
+def load_genre_index():
+    db = SessionLocal()
+    try:
+        genre_association_repository.load_genre_index(db)
+    finally:
+        db.close()
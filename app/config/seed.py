@@ -0,0 +1,10 @@
+from .books import create_default_books
+from .genres import create_default_genres
+from .users import create_default_roles_and_permissions, create_default_users
+
+
+def seed():
+    create_default_roles_and_permissions()
+    create_default_users()
+    create_default_genres()
+    create_default_books()
@@ -1,4 +1,5 @@
 from typing import List
+from sqlalchemy.orm import Session
 from ..database.enums import RolePermission, UserRole
 from ..schemas import user as user_schemas
 from ..schemas import role as role_schemas
@@ -8,10 +9,6 @@ from ..repository import user as user_repository
 from ..repository import role as role_repository
 from ..repository import permission as permission_repository
 import os
-from faker import Faker
-
-
-fake = Faker()
 
 
 class Envs:
@@ -30,87 +27,99 @@ default_librarian_data = {
 
 
 def create_default_roles_and_permissions():
-    for role_permission in RolePermission:
-        permission = permission_repository.get_one_by_name(
-            role_permission.value, SessionLocal(), True
-        )
-        if permission is None:
-            permission = permission_repository.create(
-                permission_schemas.CreatePermission(
-                    name=role_permission.value, description=role_permission.value
-                ),
-                SessionLocal(),
-            )
-    for user_role in UserRole:
-        role = role_repository.get_one_by_name(user_role.value, SessionLocal(), True)
-        if role is None:
-            role = role_repository.create(
-                role_schemas.CreateRole(
-                    name=user_role.value, description=user_role.value
-                ),
-                SessionLocal(),
-            )
+    db = SessionLocal()
+    try:
+        for role_permission in RolePermission:
             permission = permission_repository.get_one_by_name(
-                RolePermission.ALL.value, SessionLocal(), True
+                role_permission.value, db, True
             )
-            if permission is not None:
-                role_repository.create_role_permission_association(
-                    role_schemas.CreateRolePermissionAssociation(
-                        **{"role_id": role.id, "permission_id": permission.id}
+            if permission is None:
+                permission = permission_repository.create(
+                    permission_schemas.CreatePermission(
+                        name=role_permission.value, description=role_permission.value
+                    ),
+                    db,
+                )
+        for user_role in UserRole:
+            role = role_repository.get_one_by_name(user_role.value, db, True)
+            if role is None:
+                role = role_repository.create(
+                    role_schemas.CreateRole(
+                        name=user_role.value, description=user_role.value
                     ),
-                    SessionLocal(),
+                    db,
+                )
+                permission = permission_repository.get_one_by_name(
+                    RolePermission.ALL.value, db, True
                 )
+                if permission is not None:
+                    role_repository.create_role_permission_association(
+                        role_schemas.CreateRolePermissionAssociation(
+                            **{"role_id": role.id, "permission_id": permission.id}
+                        ),
+                        db,
+                    )
+    finally:
+        db.close()
 
 
-def create_default_user(user_role_names: List[str], default_user_data: dict[str, str]):
+def create_default_user(
+    user_role_names: List[str], default_user_data: dict[str, str], db: Session
+):
     if None in default_user_data.values() or "" in default_user_data.values():
         return
-    default_user = user_repository.get_one_by_email(
-        default_user_data["email"], SessionLocal(), True
-    )
+    default_user = user_repository.get_one_by_email(default_user_data["email"], db, True)
     if default_user is None:
         default_user = user_repository.create(
             user_schemas.UserSignUp(**default_user_data),
-            SessionLocal(),
+            db,
         )
         for user_role_name in user_role_names:
-            user_role = role_repository.get_one_by_name(
-                user_role_name, SessionLocal(), True
-            )
+            user_role = role_repository.get_one_by_name(user_role_name, db, True)
             if user_role is not None:
                 user_repository.create_user_role_association(
                     user_schemas.CreateUserRoleAssociation(
                         **{"user_id": default_user.id, "role_id": user_role.id}
                     ),
-                    SessionLocal(),
+                    db,
                 )
 
 
 def create_default_users():
-    # default librarian
-    create_default_user(
-        [UserRole.LIBRARIAN.value, UserRole.PROPRIETOR.value], default_librarian_data
-    )
-    user_count = user_repository.count_all(SessionLocal())
-    if user_count >= 7:
-        return
+    # faker is slow to load and only ever needed to seed
+    from faker import Faker
+
+    fake = Faker()
+    db = SessionLocal()
+    try:
+        # default librarian
+        create_default_user(
+            [UserRole.LIBRARIAN.value, UserRole.PROPRIETOR.value],
+            default_librarian_data,
+            db,
+        )
+        user_count = user_repository.count_all(db)
+        if user_count >= 7:
+            return
 
-    # default borrower
-    for borrower_index in range(4):
-        user_data = {
-            "first_name": fake.first_name(),
-            "last_name": fake.last_name(),
-            "email": fake.email(),
-            "password": "password",
-        }
-        create_default_user([UserRole.BORROWER.value], user_data)
+        # default borrower
+        for borrower_index in range(4):
+            user_data = {
+                "first_name": fake.first_name(),
+                "last_name": fake.last_name(),
+                "email": fake.email(),
+                "password": "password",
+            }
+            create_default_user([UserRole.BORROWER.value], user_data, db)
 
-    # default proprietor
-    for proprietor_index in range(2):
-        user_data = {
-            "first_name": fake.first_name(),
-            "last_name": fake.last_name(),
-            "email": fake.email(),
-            "password": "password",
-        }
-        create_default_user([UserRole.PROPRIETOR.value], user_data)
+        # default proprietor
+        for proprietor_index in range(2):
+            user_data = {
+                "first_name": fake.first_name(),
+                "last_name": fake.last_name(),
+                "email": fake.email(),
+                "password": "password",
+            }
+            create_default_user([UserRole.PROPRIETOR.value], user_data, db)
+    finally:
+        db.close()
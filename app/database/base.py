@@ -1,17 +1,27 @@
-from sqlalchemy import create_engine
+import os
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
-SQLALCHEMY_DATABASE = "sqlite:///./bibliotheque-e.db"
-engine = create_engine(
-    SQLALCHEMY_DATABASE,
-    connect_args={"check_same_thread": False},
-    pool_size=20,
-    max_overflow=10,
-    pool_timeout=80,
+from .enums import DatabaseProfile
+from .profile import create_async_engines, create_engines
+
+DATABASE_PATH = os.getenv("DATABASE_PATH") or "./bibliotheque-e.db"
+DATABASE_PROFILE = DatabaseProfile(
+    os.getenv("DATABASE_PROFILE") or DatabaseProfile.DEFAULT.value
 )
+engine, read_engine = create_engines(DATABASE_PATH, DATABASE_PROFILE)
+async_engine, async_read_engine = create_async_engines(DATABASE_PATH, DATABASE_PROFILE)
 
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+ReadSessionLocal = sessionmaker(bind=read_engine, autocommit=False, autoflush=False)
+# objects stay readable once the request's session is closed
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+AsyncReadSessionLocal = async_sessionmaker(
+    bind=async_read_engine, autoflush=False, expire_on_commit=False
+)
 
 Base = declarative_base()
 
@@ -22,3 +32,22 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    # for routes that never write, the connection is opened read-only
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db():
+    async with AsyncReadSessionLocal() as db:
+        yield db
@@ -26,3 +26,34 @@ class BorrowStatusFilter(Enum):
     ALL = "all"
     DUE_SOON = "due-soon"
     LATE = "late"
+
+
+class GenreMatchFilter(Enum):
+    ANY = "any"
+    ALL = "all"
+
+
+class SearchMode(Enum):
+    FULL_TEXT = "full-text"
+    FUZZY = "fuzzy"
+
+
+class SuggestionKind(Enum):
+    TITLE = "title"
+    AUTHOR = "author"
+    GENRE = "genre"
+
+
+class CatalogFileFormat(Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class DatabaseProfile(Enum):
+    DEFAULT = "default"
+    PRODUCTION = "production"
+
+
+class StartupMode(Enum):
+    FAST = "fast"
+    SEED = "seed"
@@ -0,0 +1,97 @@
+from datetime import datetime
+from typing import Callable, List, NamedTuple
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError
+
+from . import (
+    v0001_baseline,
+    v0002_user_auth_version,
+    v0003_open_check_out_updated_at_index,
+)
+
+SCHEMA_VERSION_TABLE = "schema_version"
+
+
+class Migration(NamedTuple):
+    version: int
+    description: str
+    upgrade: Callable[[Connection], None]
+
+
+# append only, a step that has been applied anywhere is never edited
+MIGRATIONS: List[Migration] = [
+    Migration(1, "baseline schema, indexes and search tables", v0001_baseline.upgrade),
+    Migration(
+        2, "user auth_version for token revocation", v0002_user_auth_version.upgrade
+    ),
+    Migration(
+        3,
+        "index open check-outs by (updated_at, id)",
+        v0003_open_check_out_updated_at_index.upgrade,
+    ),
+]
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def get_version(connection: Connection) -> int:
+    try:
+        version = connection.execute(
+            text(f"SELECT max(version) FROM {SCHEMA_VERSION_TABLE}")
+        ).scalar()
+    except OperationalError:
+        # no schema_version table, nothing has been migrated yet
+        return 0
+    return version or 0
+
+
+def get_pending(version: int, target: int | None = None) -> List[Migration]:
+    target = LATEST_VERSION if target is None else target
+    return [
+        migration
+        for migration in MIGRATIONS
+        if version < migration.version <= target
+    ]
+
+
+def migrate(engine: Engine, target: int | None = None) -> List[Migration]:
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {SCHEMA_VERSION_TABLE} ("
+                "version INTEGER NOT NULL PRIMARY KEY, "
+                "description TEXT NOT NULL, "
+                "applied_at DATETIME NOT NULL)"
+            )
+        )
+        version = get_version(connection)
+
+    applied = []
+    for migration in get_pending(version, target):
+        # each step commits together with its version row
+        with engine.begin() as connection:
+            migration.upgrade(connection)
+            connection.execute(
+                text(
+                    f"INSERT INTO {SCHEMA_VERSION_TABLE} "
+                    "(version, description, applied_at) "
+                    "VALUES (:version, :description, :applied_at)"
+                ),
+                {
+                    "version": migration.version,
+                    "description": migration.description,
+                    "applied_at": datetime.utcnow(),
+                },
+            )
+        applied.append(migration)
+    return applied
+
+
+def check_version(engine: Engine):
+    with engine.connect() as connection:
+        version = get_version(connection)
+    if version != LATEST_VERSION:
+        raise RuntimeError(
+            f"database schema is at version {version}, this build expects "
+            f"{LATEST_VERSION}, run `python manage.py migrate`"
+        )
@@ -0,0 +1,310 @@
+from sqlalchemy.engine import Connection
+
+# the schema as create_all built it before migrations, IF NOT EXISTS lets this
+# step adopt those databases as well as create new ones
+STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS curation (
+        id TEXT(36) NOT NULL,
+        title VARCHAR NOT NULL,
+        description TEXT,
+        published BOOLEAN,
+        created_at DATETIME NOT NULL,
+        updated_at DATETIME NOT NULL,
+        is_deleted BOOLEAN,
+        deleted_at DATETIME,
+        PRIMARY KEY (id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_curation_updated_at ON curation (updated_at, id)",
+    """
+    CREATE TABLE IF NOT EXISTS genre (
+        id TEXT(36) NOT NULL,
+        name VARCHAR NOT NULL,
+        description TEXT,
+        created_at DATETIME NOT NULL,
+        updated_at DATETIME NOT NULL,
+        is_deleted BOOLEAN,
+        deleted_at DATETIME,
+        PRIMARY KEY (id),
+        UNIQUE (name)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS permission (
+        id TEXT(36) NOT NULL,
+        name VARCHAR NOT NULL,
+        description TEXT,
+        access TEXT,
+        created_at DATETIME NOT NULL,
+        updated_at DATETIME NOT NULL,
+        is_deleted BOOLEAN,
+        deleted_at DATETIME,
+        PRIMARY KEY (id),
+        UNIQUE (name)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS role (
+        id TEXT(36) NOT NULL,
+        name VARCHAR NOT NULL,
+        description TEXT,
+        created_at DATETIME NOT NULL,
+        updated_at DATETIME NOT NULL,
+        is_deleted BOOLEAN,
+        deleted_at DATETIME,
+        PRIMARY KEY (id),
+        UNIQUE (name)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS user (
+        id TEXT(36) NOT NULL,
+        first_name VARCHAR NOT NULL,
+        last_name VARCHAR NOT NULL,
+        email VARCHAR NOT NULL,
+        password TEXT,
+        is_email_verified BOOLEAN,
+        is_verified BOOLEAN,
+        country TEXT,
+        "trigger" VARCHAR(26),
+        is_deactivated BOOLEAN NOT NULL,
+        incorrect_password_attempt_count INTEGER,
+        otp TEXT,
+        verification_code TEXT,
+        reset_password_code TEXT,
+        verification_code_last_generated_at DATETIME,
+        reset_password_code_last_generated_at DATETIME,
+        last_login DATETIME,
+        password_reset_at DATETIME,
+        created_at DATETIME NOT NULL,
+        updated_at DATETIME NOT NULL,
+        is_deleted BOOLEAN,
+        deleted_at DATETIME,
+        deactivated_at DATETIME,
+        PRIMARY KEY (id),
+        UNIQUE (email)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_user_updated_at ON user (updated_at, id)",
+    """
+    CREATE TABLE IF NOT EXISTS app_log (
+        id TEXT(36) NOT NULL,
+        user_id TEXT(36) NOT NULL,
+        details JSON NOT NULL,
+        description TEXT,
+        requires_action BOOLEAN,
+        created_at DATETIME NOT NULL,
+        updated_at DATETIME NOT NULL,
+        is_deleted BOOLEAN,
+        deleted_at DATETIME,
+        PRIMARY KEY (id),
+        FOREIGN KEY(user_id) REFERENCES user (id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS book (
+        id TEXT(36) NOT NULL,
+        proprietor_id TEXT(36) NOT NULL,
+        title VARCHAR NOT NULL,
+        author_name VARCHAR NOT NULL,
+        description TEXT,
+        img_url TEXT,
+        total_quantity INTEGER NOT NULL,
+        public_shelf_quantity INTEGER NOT NULL,
+        private_shelf_quantity INTEGER NOT NULL,
+        created_at DATETIME NOT NULL,
+        updated_at DATETIME NOT NULL,
+        is_deleted BOOLEAN,
+        deleted_at DATETIME,
+        PRIMARY KEY (id),
+        FOREIGN KEY(proprietor_id) REFERENCES user (id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_book_proprietor_id_updated_at "
+    "ON book (proprietor_id, updated_at)",
+    "CREATE INDEX IF NOT EXISTS ix_book_updated_at ON book (updated_at, id)",
+    """
+    CREATE TABLE IF NOT EXISTS curation_document (
+        curation_id TEXT(36) NOT NULL,
+        public_document TEXT,
+        private_document TEXT NOT NULL,
+        schema_version INTEGER NOT NULL,
+        updated_at DATETIME NOT NULL,
+        PRIMARY KEY (curation_id),
+        FOREIGN KEY(curation_id) REFERENCES curation (id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS faq (
+        id TEXT(36) NOT NULL,
+        author_id TEXT(36) NOT NULL,
+        question TEXT NOT NULL,
+        answer TEXT NOT NULL,
+        created_at DATETIME NOT NULL,
+        updated_at DATETIME NOT NULL,
+        is_deleted BOOLEAN,
+        deleted_at DATETIME,
+        PRIMARY KEY (id),
+        FOREIGN KEY(author_id) REFERENCES user (id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS notification (
+        id TEXT(36) NOT NULL,
+        user_id TEXT(36),
+        title VARCHAR NOT NULL,
+        description TEXT NOT NULL,
+        is_read BOOLEAN,
+        created_at DATETIME NOT NULL,
+        updated_at DATETIME NOT NULL,
+        is_deleted BOOLEAN,
+        deleted_at DATETIME,
+        PRIMARY KEY (id),
+        FOREIGN KEY(user_id) REFERENCES user (id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS role_permission_association (
+        id TEXT(36) NOT NULL,
+        role_id TEXT(36) NOT NULL,
+        permission_id TEXT(36) NOT NULL,
+        created_at DATETIME NOT NULL,
+        updated_at DATETIME NOT NULL,
+        is_deleted BOOLEAN,
+        deleted_at DATETIME,
+        PRIMARY KEY (id),
+        FOREIGN KEY(role_id) REFERENCES role (id),
+        FOREIGN KEY(permission_id) REFERENCES permission (id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_role_permission_association_permission_id "
+    "ON role_permission_association (permission_id)",
+    "CREATE INDEX IF NOT EXISTS ix_role_permission_association_role_id "
+    "ON role_permission_association (role_id)",
+    """
+    CREATE TABLE IF NOT EXISTS suspension_log (
+        id TEXT(36) NOT NULL,
+        user_id TEXT(36),
+        action VARCHAR(9),
+        "trigger" VARCHAR(26),
+        reason TEXT,
+        created_at DATETIME NOT NULL,
+        updated_at DATETIME NOT NULL,
+        is_deleted BOOLEAN,
+        deleted_at DATETIME,
+        PRIMARY KEY (id),
+        FOREIGN KEY(user_id) REFERENCES user (id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS user_role_association (
+        id TEXT(36) NOT NULL,
+        user_id TEXT(36) NOT NULL,
+        role_id TEXT(36) NOT NULL,
+        created_at DATETIME NOT NULL,
+        updated_at DATETIME NOT NULL,
+        is_deleted BOOLEAN,
+        deleted_at DATETIME,
+        PRIMARY KEY (id),
+        FOREIGN KEY(user_id) REFERENCES user (id),
+        FOREIGN KEY(role_id) REFERENCES role (id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_user_role_association_role_id "
+    "ON user_role_association (role_id)",
+    "CREATE INDEX IF NOT EXISTS ix_user_role_association_user_id "
+    "ON user_role_association (user_id)",
+    """
+    CREATE TABLE IF NOT EXISTS book_availability (
+        book_id TEXT(36) NOT NULL,
+        borrowed_count INTEGER NOT NULL,
+        updated_at DATETIME NOT NULL,
+        PRIMARY KEY (book_id),
+        FOREIGN KEY(book_id) REFERENCES book (id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS book_curation_association (
+        id TEXT(36) NOT NULL,
+        book_id TEXT(36) NOT NULL,
+        curation_id TEXT(36) NOT NULL,
+        created_at DATETIME NOT NULL,
+        updated_at DATETIME NOT NULL,
+        is_deleted BOOLEAN,
+        deleted_at DATETIME,
+        PRIMARY KEY (id),
+        FOREIGN KEY(book_id) REFERENCES book (id),
+        FOREIGN KEY(curation_id) REFERENCES curation (id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_book_curation_association_book_id "
+    "ON book_curation_association (book_id)",
+    "CREATE INDEX IF NOT EXISTS ix_book_curation_association_curation_id "
+    "ON book_curation_association (curation_id)",
+    """
+    CREATE TABLE IF NOT EXISTS book_genre_association (
+        id TEXT(36) NOT NULL,
+        book_id TEXT(36) NOT NULL,
+        genre_id TEXT(36) NOT NULL,
+        created_at DATETIME NOT NULL,
+        updated_at DATETIME NOT NULL,
+        is_deleted BOOLEAN,
+        deleted_at DATETIME,
+        PRIMARY KEY (id),
+        FOREIGN KEY(book_id) REFERENCES book (id),
+        FOREIGN KEY(genre_id) REFERENCES genre (id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_book_genre_association_book_id "
+    "ON book_genre_association (book_id)",
+    "CREATE INDEX IF NOT EXISTS ix_book_genre_association_genre_id_book_id "
+    "ON book_genre_association (genre_id, book_id)",
+    """
+    CREATE TABLE IF NOT EXISTS check_in_out (
+        id TEXT(36) NOT NULL,
+        book_id TEXT(36) NOT NULL,
+        borrower_id TEXT(36) NOT NULL,
+        checked_out_at DATETIME NOT NULL,
+        due_at DATETIME NOT NULL,
+        returned BOOLEAN,
+        returned_at DATETIME,
+        fine_owed DECIMAL NOT NULL,
+        fine_paid DECIMAL NOT NULL,
+        created_at DATETIME NOT NULL,
+        updated_at DATETIME NOT NULL,
+        is_deleted BOOLEAN,
+        deleted_at DATETIME,
+        PRIMARY KEY (id),
+        FOREIGN KEY(book_id) REFERENCES book (id),
+        FOREIGN KEY(borrower_id) REFERENCES user (id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_check_in_out_book_id_returned "
+    "ON check_in_out (book_id, returned)",
+    "CREATE INDEX IF NOT EXISTS ix_check_in_out_borrower_id_updated_at "
+    "ON check_in_out (borrower_id, updated_at)",
+    "CREATE INDEX IF NOT EXISTS ix_check_in_out_open_borrower_id_due_at "
+    "ON check_in_out (borrower_id, due_at) WHERE returned = 0",
+    "CREATE INDEX IF NOT EXISTS ix_check_in_out_open_due_at "
+    "ON check_in_out (due_at) WHERE returned = 0",
+    "CREATE INDEX IF NOT EXISTS ix_check_in_out_updated_at "
+    "ON check_in_out (updated_at, id)",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS book_search USING fts5("
+    "book_id UNINDEXED, title, author_name, description, "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS book_trigram USING fts5("
+    "book_id UNINDEXED, title, author_name, tokenize='trigram')",
+    # backfill books created before the search indexes existed
+    "INSERT INTO book_search (book_id, title, author_name, description) "
+    "SELECT id, title, author_name, coalesce(description, '') FROM book "
+    "WHERE id NOT IN (SELECT book_id FROM book_search)",
+    "INSERT INTO book_trigram (book_id, title, author_name) "
+    "SELECT id, title, author_name FROM book "
+    "WHERE id NOT IN (SELECT book_id FROM book_trigram)",
+]
+
+
+def upgrade(connection: Connection):
+    for statement in STATEMENTS:
+        connection.exec_driver_sql(statement)
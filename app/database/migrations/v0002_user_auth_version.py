@@ -0,0 +1,12 @@
+from sqlalchemy.engine import Connection
+
+# bumped on role changes and password resets, tokens carrying an older value
+# are rejected
+STATEMENTS = [
+    'ALTER TABLE "user" ADD COLUMN auth_version INTEGER NOT NULL DEFAULT 0',
+]
+
+
+def upgrade(connection: Connection):
+    for statement in STATEMENTS:
+        connection.exec_driver_sql(statement)
@@ -0,0 +1,14 @@
+from sqlalchemy.engine import Connection
+
+# due-soon and late pages are ordered by (updated_at, id), with the due_at
+# index SQLite filtered first and then sorted every page in a temp b-tree
+STATEMENTS = [
+    "DROP INDEX IF EXISTS ix_check_in_out_open_due_at",
+    "CREATE INDEX IF NOT EXISTS ix_check_in_out_open_updated_at "
+    "ON check_in_out (updated_at, id) WHERE returned = 0",
+]
+
+
+def upgrade(connection: Connection):
+    for statement in STATEMENTS:
+        connection.exec_driver_sql(statement)
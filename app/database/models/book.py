@@ -3,6 +3,7 @@ from sqlalchemy import (
     Boolean,
     Column,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
@@ -32,6 +33,11 @@ class Book(Base):
     is_deleted = Column(Boolean, default=False)
     deleted_at = Column(DateTime)
 
+    __table_args__ = (
+        Index("ix_book_updated_at", updated_at, id),
+        Index("ix_book_proprietor_id_updated_at", proprietor_id, updated_at),
+    )
+
     check_in_outs = relationship("CheckInOut")
     genre_associations = relationship(
         "BookGenreAssociation",
@@ -0,0 +1,10 @@
+from sqlalchemy import DateTime, Column, ForeignKey, Integer, Text
+from ..base import Base
+import datetime
+
+
+class BookAvailability(Base):
+    __tablename__ = "book_availability"
+    book_id = Column(Text(length=36), ForeignKey("book.id"), primary_key=True)
+    borrowed_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
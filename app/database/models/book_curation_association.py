@@ -1,4 +1,4 @@
-from sqlalchemy import DateTime, Boolean, Column, ForeignKey, Text
+from sqlalchemy import DateTime, Boolean, Column, ForeignKey, Index, Text
 from sqlalchemy.orm import relationship
 from ..base import Base
 import uuid
@@ -17,6 +17,11 @@ class BookCurationAssociation(Base):
     is_deleted = Column(Boolean, default=False)
     deleted_at = Column(DateTime)
 
+    __table_args__ = (
+        Index("ix_book_curation_association_curation_id", curation_id),
+        Index("ix_book_curation_association_book_id", book_id),
+    )
+
     curation = relationship(
         "Curation",
         back_populates="curation_associations",
@@ -1,4 +1,4 @@
-from sqlalchemy import DateTime, Boolean, Column, ForeignKey, Text
+from sqlalchemy import DateTime, Boolean, Column, ForeignKey, Index, Text
 from sqlalchemy.orm import relationship
 from ..base import Base
 import uuid
@@ -17,6 +17,11 @@ class BookGenreAssociation(Base):
     is_deleted = Column(Boolean, default=False)
     deleted_at = Column(DateTime)
 
+    __table_args__ = (
+        Index("ix_book_genre_association_book_id", book_id),
+        Index("ix_book_genre_association_genre_id_book_id", genre_id, book_id),
+    )
+
     genre = relationship("Genre", lazy=False)
     book = relationship(
         "Book",
@@ -1,4 +1,4 @@
-from sqlalchemy import DECIMAL, DateTime, Boolean, Column, ForeignKey, Text
+from sqlalchemy import DECIMAL, DateTime, Boolean, Column, ForeignKey, Index, Text
 from sqlalchemy.orm import relationship
 from ..base import Base
 import uuid
@@ -24,4 +24,24 @@ class CheckInOut(Base):
     is_deleted = Column(Boolean, default=False)
     deleted_at =  Column(DateTime)
 
+    __table_args__ = (
+        Index("ix_check_in_out_updated_at", updated_at, id),
+        Index("ix_check_in_out_borrower_id_updated_at", borrower_id, updated_at),
+        Index("ix_check_in_out_book_id_returned", book_id, returned),
+        # only open check-outs, which the due-soon and late pages read in
+        # keyset order
+        Index(
+            "ix_check_in_out_open_updated_at",
+            updated_at,
+            id,
+            sqlite_where=returned == False,
+        ),
+        Index(
+            "ix_check_in_out_open_borrower_id_due_at",
+            borrower_id,
+            due_at,
+            sqlite_where=returned == False,
+        ),
+    )
+
     book = relationship("Book", lazy=False, back_populates="check_in_outs")
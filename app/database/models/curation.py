@@ -2,6 +2,7 @@ from sqlalchemy import (
     DateTime,
     Boolean,
     Column,
+    Index,
     String,
     Text,
 )
@@ -25,6 +26,8 @@ class Curation(Base):
     is_deleted = Column(Boolean, default=False)
     deleted_at = Column(DateTime)
 
+    __table_args__ = (Index("ix_curation_updated_at", updated_at, id),)
+
     curation_associations = relationship(
         "BookCurationAssociation",
         lazy=False
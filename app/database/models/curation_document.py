@@ -0,0 +1,13 @@
+from sqlalchemy import DateTime, Column, ForeignKey, Integer, Text
+from ..base import Base
+import datetime
+
+
+class CurationDocument(Base):
+    __tablename__ = "curation_document"
+    curation_id = Column(Text(length=36), ForeignKey("curation.id"), primary_key=True)
+    # pre-serialized ShowCuration json, null while the curation is unpublished
+    public_document = Column(Text)
+    private_document = Column(Text, nullable=False)
+    schema_version = Column(Integer, nullable=False)
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
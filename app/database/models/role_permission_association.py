@@ -1,4 +1,4 @@
-from sqlalchemy import DateTime, Boolean, Column, ForeignKey, Text
+from sqlalchemy import DateTime, Boolean, Column, ForeignKey, Index, Text
 from ..base import Base
 import uuid
 import datetime
@@ -17,4 +17,9 @@ class RolePermissionAssociation(Base):
     is_deleted = Column(Boolean, default=False)
     deleted_at = Column(DateTime)
 
+    __table_args__ = (
+        Index("ix_role_permission_association_role_id", role_id),
+        Index("ix_role_permission_association_permission_id", permission_id),
+    )
+
     permission = relationship("Permission", lazy=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import DateTime, Boolean, Column, Enum, Integer, String, Text
+from sqlalchemy import DateTime, Boolean, Column, Enum, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 from ..enums import EnumSuspensionStatus
 from ..base import Base
@@ -28,12 +28,15 @@ class User(Base):
     reset_password_code_last_generated_at =  Column(DateTime)
     last_login =  Column(DateTime)
     password_reset_at =  Column(DateTime)
+    auth_version = Column(Integer, nullable=False, default=0, server_default="0")
     created_at =  Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
     updated_at =  Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
     is_deleted = Column(Boolean, default=False)
     deleted_at =  Column(DateTime)
     deactivated_at =  Column(DateTime)
 
+    __table_args__ = (Index("ix_user_updated_at", updated_at, id),)
+
     user_role_associations = relationship(
         "UserRoleAssociation", lazy=False, viewonly=True
     )
@@ -1,4 +1,4 @@
-from sqlalchemy import DateTime, Boolean, Column, ForeignKey, Text
+from sqlalchemy import DateTime, Boolean, Column, ForeignKey, Index, Text
 from sqlalchemy.orm import relationship
 from ..base import Base
 import uuid
@@ -17,5 +17,10 @@ class UserRoleAssociation(Base):
     is_deleted = Column(Boolean, default=False)
     deleted_at =  Column(DateTime)
 
+    __table_args__ = (
+        Index("ix_user_role_association_user_id", user_id),
+        Index("ix_user_role_association_role_id", role_id),
+    )
+
     users = relationship("User", lazy=False)
     role = relationship("Role",  lazy=False)
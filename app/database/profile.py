@@ -0,0 +1,103 @@
+from typing import Tuple
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from ..utils.constants import (
+    SQLITE_BUSY_TIMEOUT_MS,
+    SQLITE_CACHE_SIZE,
+    SQLITE_MMAP_SIZE,
+    SQLITE_READER_POOL_SIZE,
+    SQLITE_WRITER_MAX_OVERFLOW,
+    SQLITE_WRITER_POOL_SIZE,
+)
+from .enums import DatabaseProfile
+
+READ_PRAGMAS = {
+    "busy_timeout": SQLITE_BUSY_TIMEOUT_MS,
+    "mmap_size": SQLITE_MMAP_SIZE,
+    "cache_size": SQLITE_CACHE_SIZE,
+    "temp_store": "MEMORY",
+}
+# journal_mode is stored in the file, so only the writers need to set it
+WRITE_PRAGMAS = {"journal_mode": "WAL", "synchronous": "NORMAL", **READ_PRAGMAS}
+
+
+def set_pragmas(engine: Engine, pragmas: dict):
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+        cursor.close()
+
+
+def use_deferred_transactions(engine: Engine):
+    # the driver only opens transactions before writes, this opens a deferred
+    # one on the first read so a session reads one snapshot. only for WAL, in
+    # rollback journal mode the open read would hold off every writer
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def on_begin(connection):
+        connection.exec_driver_sql("BEGIN DEFERRED")
+
+
+def get_engine_options(profile: DatabaseProfile, is_read: bool) -> dict:
+    if profile == DatabaseProfile.DEFAULT:
+        return {"pool_size": 20, "max_overflow": 10, "pool_timeout": 80}
+    if is_read:
+        return {
+            "pool_size": SQLITE_READER_POOL_SIZE,
+            "max_overflow": 0,
+            "pool_timeout": 80,
+        }
+    # sqlite takes one writer at a time, more connections only queue on its lock
+    return {
+        "pool_size": SQLITE_WRITER_POOL_SIZE,
+        "max_overflow": SQLITE_WRITER_MAX_OVERFLOW,
+        "pool_timeout": 80,
+    }
+
+
+def get_url(driver: str, path: str, is_read: bool) -> str:
+    if is_read:
+        return f"sqlite+{driver}:///file:{path}?mode=ro&uri=true"
+    return f"sqlite+{driver}:///{path}"
+
+
+def create_engines(path: str, profile: DatabaseProfile) -> Tuple[Engine, Engine]:
+    # (write engine, read-only engine)
+    engine = create_engine(
+        get_url("pysqlite", path, False),
+        connect_args={"check_same_thread": False},
+        **get_engine_options(profile, False),
+    )
+    read_engine = create_engine(
+        get_url("pysqlite", path, True),
+        connect_args={"check_same_thread": False},
+        **get_engine_options(profile, True),
+    )
+    if profile == DatabaseProfile.PRODUCTION:
+        set_pragmas(engine, WRITE_PRAGMAS)
+        set_pragmas(read_engine, READ_PRAGMAS)
+        use_deferred_transactions(read_engine)
+    return engine, read_engine
+
+
+def create_async_engines(
+    path: str, profile: DatabaseProfile
+) -> Tuple[AsyncEngine, AsyncEngine]:
+    engine = create_async_engine(
+        get_url("aiosqlite", path, False), **get_engine_options(profile, False)
+    )
+    read_engine = create_async_engine(
+        get_url("aiosqlite", path, True), **get_engine_options(profile, True)
+    )
+    if profile == DatabaseProfile.PRODUCTION:
+        set_pragmas(engine.sync_engine, WRITE_PRAGMAS)
+        set_pragmas(read_engine.sync_engine, READ_PRAGMAS)
+        use_deferred_transactions(read_engine.sync_engine)
+    return engine, read_engine
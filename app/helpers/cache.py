@@ -0,0 +1,88 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable
+import anyio
+
+
+class VersionCounter:
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def bump(self):
+        with self._lock:
+            self.value += 1
+
+
+class VersionedLRUCache:
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.version = 0
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._loading: Dict[Hashable, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]):
+        while True:
+            is_cached, value, loading, version = self._claim(key)
+            if is_cached:
+                return value
+            if version is not None:
+                break
+            # another request is already loading this key, wait for its result
+            loading.wait()
+
+        try:
+            value = loader()
+            self._store(key, value, version)
+            return value
+        finally:
+            self._release(key, loading)
+
+    async def get_or_load_async(
+        self, key: Hashable, loader: Callable[[], Awaitable[Any]]
+    ):
+        while True:
+            is_cached, value, loading, version = self._claim(key)
+            if is_cached:
+                return value
+            if version is not None:
+                break
+            # wait off the event loop, the loader may be a sync request
+            await anyio.to_thread.run_sync(loading.wait)
+
+        try:
+            value = await loader()
+            self._store(key, value, version)
+            return value
+        finally:
+            self._release(key, loading)
+
+    def _claim(self, key: Hashable):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return True, self._entries[key], None, None
+            loading = self._loading.get(key)
+            if loading is not None:
+                return False, None, loading, None
+            loading = self._loading[key] = threading.Event()
+            return False, None, loading, self.version
+
+    def _store(self, key: Hashable, value: Any, version: int):
+        with self._lock:
+            # drop results that were read before an invalidation
+            if version == self.version:
+                self._entries[key] = value
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+
+    def _release(self, key: Hashable, loading: threading.Event):
+        with self._lock:
+            del self._loading[key]
+        loading.set()
@@ -0,0 +1,26 @@
+from ..utils.constants import PUBLIC_CATALOG_CACHE_SIZE
+from .cache import VersionCounter, VersionedLRUCache
+
+books_cache = VersionedLRUCache(max_size=PUBLIC_CATALOG_CACHE_SIZE)
+genres_cache = VersionedLRUCache(max_size=1)
+curations_version = VersionCounter()
+
+
+def invalidate_books():
+    books_cache.invalidate()
+
+
+def invalidate_book_details():
+    books_cache.invalidate()
+    # curations embed their books' details but not their borrow counts
+    curations_version.bump()
+
+
+def invalidate_genres():
+    genres_cache.invalidate()
+    # book and curation responses embed their genres
+    invalidate_book_details()
+
+
+def invalidate_curations():
+    curations_version.bump()
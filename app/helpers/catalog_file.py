@@ -0,0 +1,69 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import IO, Any, Dict, Iterable, Iterator, List, Tuple
+
+
+def _to_json_value(value: Any):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def to_ndjson(rows: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps({key: _to_json_value(value) for key, value in row.items()})
+        yield "\n"
+
+
+def to_csv(rows: Iterable[Dict[str, Any]], fieldnames: List[str]) -> Iterator[str]:
+    # one reusable buffer, so only the current line is ever held in memory
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames)
+    writer.writeheader()
+    yield _drain(buffer)
+    for row in rows:
+        writer.writerow(
+            {
+                key: ";".join(value) if isinstance(value, list) else _to_json_value(value)
+                for key, value in row.items()
+            }
+        )
+        yield _drain(buffer)
+
+
+def _drain(buffer: io.StringIO) -> str:
+    value = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return value
+
+
+# readers yield (line number, row), the row being an error message if unreadable
+def read_ndjson(file: IO[bytes]) -> Iterator[Tuple[int, Dict[str, Any] | str]]:
+    line_number = 0
+    try:
+        for line_number, line in enumerate(
+            io.TextIOWrapper(file, encoding="utf-8-sig"), start=1
+        ):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                yield line_number, "invalid json"
+                continue
+            if not isinstance(row, dict):
+                yield line_number, "expected a json object"
+                continue
+            yield line_number, row
+    except UnicodeDecodeError:
+        yield line_number + 1, "invalid utf-8"
+
+
+def read_csv(file: IO[bytes]) -> Iterator[Tuple[int, Dict[str, Any] | str]]:
+    reader = csv.DictReader(io.TextIOWrapper(file, encoding="utf-8-sig", newline=""))
+    try:
+        for row in reader:
+            yield reader.line_num, row
+    except (csv.Error, UnicodeDecodeError) as exception:
+        yield reader.line_num, f"invalid csv: {exception}"
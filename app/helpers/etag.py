@@ -0,0 +1,33 @@
+import hashlib
+import uuid
+from typing import Hashable
+from fastapi import Request, Response, status
+
+# versions are per process, so tags from another worker or a restart never match
+BOOT_ID = uuid.uuid4().hex
+
+
+def make_etag(resource: str, version: int, variant: Hashable = None):
+    digest = hashlib.sha1(
+        f"{BOOT_ID}:{resource}:{version}:{variant!r}".encode()
+    ).hexdigest()
+    return f'"{digest}"'
+
+
+def is_not_modified(request: Request, etag: str):
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+def set_cache_headers(response: Response, etag: str, cache_control: str):
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+
+
+def not_modified_response(etag: str, cache_control: str):
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_cache_headers(response, etag, cache_control)
+    return response
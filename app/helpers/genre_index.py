@@ -0,0 +1,78 @@
+import threading
+from functools import reduce
+from operator import and_, or_
+from typing import Dict, Iterable, List, Tuple
+
+
+class GenreBitmapIndex:
+    # genre id -> int bitmap whose set bits are positions in self._book_ids
+    def __init__(self):
+        self.is_ready = False
+        self._lock = threading.Lock()
+        self._book_ids: List[str | None] = []
+        self._positions: Dict[str, int] = {}
+        self._free_positions: List[int] = []
+        self._bitmaps: Dict[str, int] = {}
+
+    def build(self, associations: Iterable[Tuple[str, str]]):
+        with self._lock:
+            self._book_ids = []
+            self._positions = {}
+            self._free_positions = []
+            self._bitmaps = {}
+            for book_id, genre_id in associations:
+                self._add(book_id, genre_id)
+            self.is_ready = True
+
+    def add(self, associations: Iterable[Tuple[str, str]]):
+        with self._lock:
+            for book_id, genre_id in associations:
+                self._add(book_id, genre_id)
+
+    def remove(self, associations: Iterable[Tuple[str, str]]):
+        with self._lock:
+            for book_id, genre_id in associations:
+                position = self._positions.get(book_id)
+                if position is not None and genre_id in self._bitmaps:
+                    self._bitmaps[genre_id] &= ~(1 << position)
+
+    def remove_book(self, book_id: str):
+        with self._lock:
+            position = self._positions.pop(book_id, None)
+            if position is None:
+                return
+            mask = ~(1 << position)
+            for genre_id in self._bitmaps:
+                self._bitmaps[genre_id] &= mask
+            self._book_ids[position] = None
+            self._free_positions.append(position)
+
+    def match(self, genre_ids: List[str], match_all: bool) -> List[str]:
+        with self._lock:
+            bitmaps = [self._bitmaps.get(genre_id, 0) for genre_id in genre_ids]
+            if not bitmaps:
+                return []
+            bitmap = reduce(and_ if match_all else or_, bitmaps)
+            # least significant bit first, so string offsets are positions
+            bits = bin(bitmap)[:1:-1]
+            book_ids = []
+            position = bits.find("1")
+            while position != -1:
+                book_ids.append(self._book_ids[position])
+                position = bits.find("1", position + 1)
+            return book_ids
+
+    def _add(self, book_id: str, genre_id: str):
+        position = self._positions.get(book_id)
+        if position is None:
+            if self._free_positions:
+                position = self._free_positions.pop()
+                self._book_ids[position] = book_id
+            else:
+                position = len(self._book_ids)
+                self._book_ids.append(book_id)
+            self._positions[book_id] = position
+        self._bitmaps[genre_id] = self._bitmaps.get(genre_id, 0) | (1 << position)
+
+
+genre_index = GenreBitmapIndex()
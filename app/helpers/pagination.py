@@ -0,0 +1,84 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Callable, List, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import DateTime, Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query
+
+
+def encode_cursor(values: List[Any]) -> str:
+    payload = json.dumps(
+        [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_columns: List) -> List[Any]:
+    try:
+        padded_cursor = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded_cursor.encode()))
+        if not isinstance(values, list) or len(values) != len(sort_columns):
+            raise ValueError(cursor)
+        return [
+            datetime.fromisoformat(value)
+            if isinstance(getattr(column, "type", None), DateTime)
+            else value
+            for column, value in zip(sort_columns, values)
+        ]
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="invalid cursor"
+        )
+
+
+def filter_after_cursor(
+    query, sort_columns: List, cursor: str | None, descending: bool = True
+):
+    # sort_columns must match the query's ORDER BY, the last one being unique
+    if not cursor:
+        return query
+    key = tuple_(*sort_columns)
+    values = tuple_(*decode_cursor(cursor, sort_columns))
+    return query.filter(key < values if descending else key > values)
+
+
+def get_page(
+    rows: List[Any], get_sort_values: Callable[[Any], List[Any]], limit: int
+) -> Tuple[List[Any], str | None]:
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(get_sort_values(rows[-1]))
+
+
+def paginate(
+    query: Query,
+    sort_columns: List,
+    get_sort_values: Callable[[Any], List[Any]],
+    cursor: str | None,
+    limit: int | None,
+    descending: bool = True,
+) -> Tuple[List[Any], str | None]:
+    query = filter_after_cursor(query, sort_columns, cursor, descending)
+    if limit is None:
+        return query.all(), None
+    return get_page(query.limit(limit + 1).all(), get_sort_values, limit)
+
+
+async def paginate_async(
+    db: AsyncSession,
+    statement: Select,
+    sort_columns: List,
+    get_sort_values: Callable[[Any], List[Any]],
+    cursor: str | None,
+    limit: int | None,
+    descending: bool = True,
+) -> Tuple[List[Any], str | None]:
+    statement = filter_after_cursor(statement, sort_columns, cursor, descending)
+    if limit is None:
+        return (await db.execute(statement)).all(), None
+    rows = (await db.execute(statement.limit(limit + 1))).all()
+    return get_page(rows, get_sort_values, limit)
@@ -0,0 +1,131 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, FrozenSet, NamedTuple, Set, Tuple
+
+from ..utils.constants import PRINCIPAL_CACHE_SIZE, PRINCIPAL_CACHE_TTL_SECONDS
+
+
+class Principal(NamedTuple):
+    id: str
+    role_names: FrozenSet[str]
+    is_manager_user: bool
+
+
+class PrincipalCache:
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.version = 0
+        # token -> (expires at, principal), oldest use first
+        self._entries: OrderedDict[str, Tuple[float, Principal]] = OrderedDict()
+        self._user_tokens: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Principal | None:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            expires_at, principal = entry
+            if expires_at <= time.monotonic():
+                self._remove(token)
+                return None
+            self._entries.move_to_end(token)
+            return principal
+
+    def set(
+        self, token: str, principal: Principal, version: int, token_expires_at: float
+    ):
+        # token_expires_at is a unix timestamp, the entry never outlives the token
+        expires_at = time.monotonic() + min(
+            self.ttl_seconds, token_expires_at - time.time()
+        )
+        with self._lock:
+            # drop principals that were read before an invalidation
+            if version != self.version:
+                return
+            self._remove(token)
+            self._entries[token] = (expires_at, principal)
+            self._user_tokens.setdefault(principal.id, set()).add(token)
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: str):
+        with self._lock:
+            self.version += 1
+            for token in list(self._user_tokens.get(user_id, ())):
+                self._remove(token)
+
+    def clear(self):
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+            self._user_tokens.clear()
+
+    def _remove(self, token: str):
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+        user_id = entry[1].id
+        tokens = self._user_tokens.get(user_id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._user_tokens[user_id]
+
+
+class AuthVersionTable:
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.version = 0
+        # user id -> (expires at, auth_version), oldest use first
+        self._entries: OrderedDict[str, Tuple[float, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: str) -> int | None:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, auth_version = entry
+            if expires_at <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return auth_version
+
+    def set(self, user_id: str, auth_version: int, version: int):
+        with self._lock:
+            # drop values that were read before an invalidation
+            if version != self.version:
+                return
+            expires_at = time.monotonic() + self.ttl_seconds
+            self._entries[user_id] = (expires_at, auth_version)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: str):
+        with self._lock:
+            self.version += 1
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+
+
+principal_cache = PrincipalCache(
+    max_size=PRINCIPAL_CACHE_SIZE, ttl_seconds=PRINCIPAL_CACHE_TTL_SECONDS
+)
+auth_versions = AuthVersionTable(
+    max_size=PRINCIPAL_CACHE_SIZE, ttl_seconds=PRINCIPAL_CACHE_TTL_SECONDS
+)
+
+
+def invalidate_user(user_id: str):
+    principal_cache.invalidate_user(user_id)
+    auth_versions.invalidate(user_id)
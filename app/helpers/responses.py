@@ -0,0 +1,42 @@
+import json
+from typing import Any, List
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from ..schemas import book as book_schemas
+
+# built once at import, then every response is validated once and encoded
+# straight to JSON bytes instead of going through response_model again
+book_public_adapter = TypeAdapter(book_schemas.ShowBookPublicResponse)
+book_private_adapter = TypeAdapter(book_schemas.ShowBookPrivateResponse)
+books_public_adapter = TypeAdapter(book_schemas.ShowBooksPublicResponse)
+books_private_adapter = TypeAdapter(book_schemas.ShowBooksPrivateResponse)
+books_public_fields_adapter = TypeAdapter(book_schemas.ShowBooksPublicFieldsResponse)
+books_private_fields_adapter = TypeAdapter(
+    book_schemas.ShowBooksPrivateFieldsResponse
+)
+
+
+def to_json(adapter: TypeAdapter, content: Any, exclude_unset: bool = False) -> bytes:
+    # exclude_unset leaves out the fields a sparse fieldset did not ask for
+    return adapter.dump_json(
+        adapter.validate_python(content), exclude_unset=exclude_unset
+    )
+
+
+def json_response(content: bytes) -> Response:
+    return Response(content, media_type="application/json")
+
+
+def serialize(adapter: TypeAdapter, content: Any, exclude_unset: bool = False):
+    return json_response(to_json(adapter, content, exclude_unset))
+
+
+def document_response(document: str, **fields) -> Response:
+    # the document is stored json, spliced in rather than decoded and re-encoded
+    envelope = json.dumps({"message": "success", **fields})
+    return json_response(f'{envelope[:-1]}, "data": {document}}}'.encode())
+
+
+def documents_response(documents: List[str], **fields) -> Response:
+    return document_response(f"[{','.join(documents)}]", **fields)
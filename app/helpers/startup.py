@@ -0,0 +1,31 @@
+import logging
+import time
+from contextlib import contextmanager
+from typing import List, Tuple
+
+# uvicorn configures this logger, so the timings show up next to its own
+logger = logging.getLogger("uvicorn.error")
+
+
+class StartupTimer:
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.phases: List[Tuple[str, float]] = []
+
+    def record(self, name: str, started_at: float):
+        duration_ms = (time.perf_counter() - started_at) * 1000
+        self.phases.append((name, duration_ms))
+        logger.info("startup: %s took %.1f ms", name, duration_ms)
+
+    @contextmanager
+    def phase(self, name: str):
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, started_at)
+
+    def report(self):
+        total_ms = (time.perf_counter() - self.started_at) * 1000
+        logger.info("startup: ready after %.1f ms", total_ms)
+        return total_ms
@@ -0,0 +1,276 @@
+import heapq
+import re
+import threading
+from typing import Dict, Iterable, List, Set, Tuple
+
+from ..database.enums import SuggestionKind
+from ..utils.constants import (
+    SUGGESTION_MAX_KEY_LENGTH,
+    SUGGESTION_TOP_K,
+    SUGGESTION_TRIE_DEPTH,
+)
+
+# (kind, text) of a suggestion
+Term = Tuple[str, str]
+
+
+def normalize(value: str | None) -> str:
+    words = re.findall(r"\w+", (value or "").lower())
+    return " ".join(words)[:SUGGESTION_MAX_KEY_LENGTH]
+
+
+def get_keys(value: str) -> Set[str]:
+    # every word start is indexed, so "adi" suggests "Chimamanda Ngozi Adichie"
+    words = re.findall(r"\w+", value.lower())
+    return {
+        " ".join(words[index:])[:SUGGESTION_MAX_KEY_LENGTH]
+        for index in range(len(words))
+    }
+
+
+class _Node:
+    __slots__ = ("children", "terms", "top")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        # terms whose key ends here, or at the depth limit runs on past it
+        self.terms: Set[Term] = set()
+        # best terms of the whole subtree, heaviest first
+        self.top: List[Term] = []
+
+
+class SuggestionTrie:
+    def __init__(
+        self, top_k: int = SUGGESTION_TOP_K, max_depth: int = SUGGESTION_TRIE_DEPTH
+    ):
+        self.is_ready = False
+        self._lock = threading.Lock()
+        self._top_k = top_k
+        self._max_depth = max_depth
+        self._root = _Node()
+        self._weights: Dict[Term, int] = {}
+        self._books: Dict[str, Tuple[str, str]] = {}
+        self._popularity: Dict[str, int] = {}
+        self._genres: Dict[str, str] = {}
+        self._genre_books: Dict[str, Set[str]] = {}
+
+    def build(
+        self,
+        books: Iterable[Tuple[str, str, str, bool, int]],
+        genres: Iterable[Tuple[str, str]],
+        associations: Iterable[Tuple[str, str]],
+    ):
+        with self._lock:
+            self._root = _Node()
+            self._weights = {}
+            self._books = {}
+            self._popularity = {}
+            self._genres = {}
+            self._genre_books = {}
+            for book_id, genre_id in associations:
+                self._genre_books.setdefault(genre_id, set()).add(book_id)
+            for genre_id, name in genres:
+                self._genres[genre_id] = name
+                self._add_weight(
+                    (SuggestionKind.GENRE.value, name), self._genre_weight(genre_id)
+                )
+            for book_id, title, author_name, is_visible, borrow_count in books:
+                self._popularity[book_id] = 1 + borrow_count
+                if is_visible:
+                    self._show_book(book_id, title, author_name)
+
+            # rank once bottom-up instead of after every insert
+            for term in self._weights:
+                for key in get_keys(term[1]):
+                    self._get_node(key).terms.add(term)
+            self._rank_subtree(self._root)
+            self.is_ready = True
+
+    def set_book(self, book_id: str, title: str, author_name: str, is_visible: bool):
+        with self._lock:
+            changed = self._hide_book(book_id)
+            if is_visible:
+                self._popularity.setdefault(book_id, 1)
+                changed += self._show_book(book_id, title, author_name)
+            self._refresh(changed)
+
+    def remove_book(self, book_id: str):
+        with self._lock:
+            changed = self._hide_book(book_id)
+            self._popularity.pop(book_id, None)
+            for genre_id, book_ids in self._genre_books.items():
+                if book_id in book_ids:
+                    book_ids.discard(book_id)
+                    changed += self._set_genre_weight(genre_id)
+            self._refresh(changed)
+
+    def record_borrow(self, book_id: str):
+        with self._lock:
+            self._popularity[book_id] = self._popularity.get(book_id, 1) + 1
+            book = self._books.get(book_id)
+            if book is None:
+                return
+            title, author_name = book
+            changed = [
+                self._add_weight((SuggestionKind.TITLE.value, title), 1),
+                self._add_weight((SuggestionKind.AUTHOR.value, author_name), 1),
+            ]
+            self._refresh(changed)
+
+    def set_genre(self, genre_id: str, name: str):
+        with self._lock:
+            changed = []
+            old_name = self._genres.get(genre_id)
+            weight = self._genre_weight(genre_id)
+            if old_name is not None:
+                changed.append(
+                    self._add_weight((SuggestionKind.GENRE.value, old_name), -weight)
+                )
+            self._genres[genre_id] = name
+            changed.append(self._add_weight((SuggestionKind.GENRE.value, name), weight))
+            self._refresh(changed)
+
+    def add_associations(self, associations: Iterable[Tuple[str, str]]):
+        with self._lock:
+            changed = []
+            for book_id, genre_id in associations:
+                self._genre_books.setdefault(genre_id, set()).add(book_id)
+                changed += self._set_genre_weight(genre_id)
+            self._refresh(changed)
+
+    def remove_associations(self, associations: Iterable[Tuple[str, str]]):
+        with self._lock:
+            changed = []
+            for book_id, genre_id in associations:
+                self._genre_books.get(genre_id, set()).discard(book_id)
+                changed += self._set_genre_weight(genre_id)
+            self._refresh(changed)
+
+    def suggest(self, prefix: str, limit: int) -> List[Tuple[str, str, int]]:
+        key = normalize(prefix)
+        with self._lock:
+            node = self._find_node(key)
+            if node is None:
+                return []
+            if len(key) <= self._max_depth:
+                terms = node.top[:limit]
+            else:
+                # past the depth limit only this node's terms can still match
+                terms = heapq.nsmallest(
+                    limit,
+                    (
+                        term
+                        for term in node.terms
+                        if term in self._weights
+                        and any(match.startswith(key) for match in get_keys(term[1]))
+                    ),
+                    key=self._rank_key,
+                )
+            return [(text, kind, self._weights[(kind, text)]) for kind, text in terms]
+
+    def _show_book(self, book_id: str, title: str, author_name: str) -> List[Term]:
+        popularity = self._popularity[book_id]
+        self._books[book_id] = (title, author_name)
+        return [
+            self._add_weight((SuggestionKind.TITLE.value, title), popularity),
+            self._add_weight((SuggestionKind.AUTHOR.value, author_name), popularity),
+        ]
+
+    def _hide_book(self, book_id: str) -> List[Term]:
+        book = self._books.pop(book_id, None)
+        if book is None:
+            return []
+        title, author_name = book
+        popularity = self._popularity[book_id]
+        return [
+            self._add_weight((SuggestionKind.TITLE.value, title), -popularity),
+            self._add_weight((SuggestionKind.AUTHOR.value, author_name), -popularity),
+        ]
+
+    def _genre_weight(self, genre_id: str) -> int:
+        return 1 + len(self._genre_books.get(genre_id, ()))
+
+    def _set_genre_weight(self, genre_id: str) -> List[Term]:
+        name = self._genres.get(genre_id)
+        if name is None:
+            return []
+        term = (SuggestionKind.GENRE.value, name)
+        self._weights[term] = self._genre_weight(genre_id)
+        return [term]
+
+    def _add_weight(self, term: Term, delta: int) -> Term:
+        weight = self._weights.get(term, 0) + delta
+        if weight > 0:
+            self._weights[term] = weight
+        else:
+            self._weights.pop(term, None)
+        return term
+
+    def _refresh(self, terms: Iterable[Term]):
+        # detach or attach every changed term first, then re-rank the paths
+        keys = set()
+        for term in set(terms):
+            for key in get_keys(term[1]):
+                keys.add(key)
+                if term in self._weights:
+                    self._get_node(key).terms.add(term)
+                else:
+                    node = self._find_node(key)
+                    if node is not None:
+                        node.terms.discard(term)
+        for key in keys:
+            self._rank_path(key)
+
+    def _get_node(self, key: str) -> _Node:
+        node = self._root
+        for char in key[: self._max_depth]:
+            child = node.children.get(char)
+            if child is None:
+                child = node.children[char] = _Node()
+            node = child
+        return node
+
+    def _find_node(self, key: str) -> _Node | None:
+        node = self._root
+        for char in key[: self._max_depth]:
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node
+
+    def _rank_path(self, key: str):
+        key = key[: self._max_depth]
+        path = [self._root]
+        for char in key:
+            node = path[-1].children.get(char)
+            if node is None:
+                break
+            path.append(node)
+        for depth in range(len(path) - 1, -1, -1):
+            node = path[depth]
+            if depth and not node.terms and not node.children:
+                del path[depth - 1].children[key[depth - 1]]
+                continue
+            self._rank(node)
+
+    def _rank_subtree(self, root: _Node):
+        stack = [(root, False)]
+        while stack:
+            node, is_visited = stack.pop()
+            if is_visited:
+                self._rank(node)
+                continue
+            stack.append((node, True))
+            stack.extend((child, False) for child in node.children.values())
+
+    def _rank(self, node: _Node):
+        candidates = {term for term in node.terms if term in self._weights}
+        for child in node.children.values():
+            candidates.update(term for term in child.top if term in self._weights)
+        node.top = heapq.nsmallest(self._top_k, candidates, key=self._rank_key)
+
+    def _rank_key(self, term: Term):
+        return (-self._weights[term], term[1].lower(), term[0])
+
+
+suggestion_index = SuggestionTrie()
@@ -1,7 +1,9 @@
 from datetime import datetime, timedelta
-from typing import List
+from typing import Callable, Dict, List, Tuple
 
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import Column
+from sqlalchemy.orm import Session
 
 from app.database.models.check_in_out import CheckInOut
 from app.database.models.user import User
@@ -14,17 +16,38 @@ from ..helpers.send_email import send_email_async
 from app.repository.check_in_out import get_all_due_soon_books, get_all_late_books
 
 
+def get_borrowers(check_outs: List[CheckInOut], db: Session) -> Dict[str, User | None]:
+    # loaded up front so no connection is held while waiting on SMTP
+    borrowers = {}
+    for check_out in check_outs:
+        borrower_id: Column[str] = check_out.borrower_id
+        if borrower_id not in borrowers:
+            borrowers[borrower_id] = user_repository.get_one(borrower_id, db, True)
+    return borrowers
+
+
+def load_reminders(
+    get_check_outs: Callable[[Session], Tuple[List[CheckInOut], str | None]]
+) -> Tuple[List[CheckInOut], Dict[str, User | None]]:
+    db = SessionLocal()
+    try:
+        check_outs, _ = get_check_outs(db)
+        return check_outs, get_borrowers(check_outs, db)
+    finally:
+        db.close()
+
+
 async def send_due_soon_reminders():
     due_time = datetime.utcnow() + timedelta(days=DUE_DAYS_REMINDER_AT)
 
-    check_outs: List[CheckInOut] = get_all_due_soon_books(due_time, SessionLocal())
+    # the queries are synchronous, keep them off the event loop serving requests
+    check_outs, borrowers = await run_in_threadpool(
+        load_reminders, lambda db: get_all_due_soon_books(due_time, db)
+    )
 
     # Iterate over the books and send emails
     for check_out in check_outs:
-        borrower_id: Column[str] = check_out.borrower_id
-        borrower: User | None = user_repository.get_one(
-            borrower_id, SessionLocal(), True
-        )
+        borrower: User | None = borrowers.get(check_out.borrower_id)
 
         if borrower:
             await send_email_async(
@@ -37,14 +60,11 @@ async def send_due_soon_reminders():
 
 
 async def send_late_reminders():
-    check_outs: List[CheckInOut] = get_all_late_books(SessionLocal())
+    check_outs, borrowers = await run_in_threadpool(load_reminders, get_all_late_books)
 
     # Iterate over the books and send emails
     for check_out in check_outs:
-        borrower_id: Column[str] = check_out.borrower_id
-        borrower: User | None = user_repository.get_one(
-            borrower_id, SessionLocal(), True
-        )
+        borrower: User | None = borrowers.get(check_out.borrower_id)
 
         if borrower:
             await send_email_async(
@@ -2,33 +2,31 @@ import os
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
-from app.config.books import create_default_books
-from app.config.genres import create_default_genres
+from app.helpers.startup import StartupTimer, logger
+
+# started before the imports below so the import cost is part of the report
+startup_timer = StartupTimer()
+
+from app.config.books import load_suggestion_index, reconcile_book_availability
+from app.config.curations import render_curation_documents
+from app.config.genres import load_genre_index
+from app.config.seed import seed
 from app.jobs.reminder import send_due_soon_reminders, send_late_reminders
+from app.repository.hashing import hashing_service
 
-from .config.users import create_default_roles_and_permissions, create_default_users
 from .routers import library, user
 from .database.base import engine
-from .database.models import user as user_model
-from .database.models import role as role_model
-from .database.models import permission as permission_model
-from .database.models import user_role_association as user_role_association_model
-from .database.models import (
-    role_permission_association as role_permission_association_model,
-)
-from .database.models import suspension_log as suspension_log_model
-from .database.models import book as book_model
-from .database.models import genre as genre_model
-from .database.models import book_genre_association as book_genre_association_model
-from .database.models import check_in_out as check_in_out_model
-from .database.models import notification as notification_model
-from .database.models import faq as faq_model
-from .database.models import app_log as app_log_model
+from .database.enums import StartupMode
+from .database.migrations import check_version
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi_utilities import repeat_every
 
+startup_timer.record("imports", startup_timer.started_at)
+
+STARTUP_MODE = StartupMode(os.getenv("STARTUP_MODE") or StartupMode.FAST.value)
 
-@repeat_every(seconds=60 * 60)  # every hour
+
+@repeat_every(seconds=60 * 60, logger=logger)  # every hour
 async def run_jobs():
     await send_due_soon_reminders()
     await send_late_reminders()
@@ -36,32 +34,33 @@ async def run_jobs():
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    create_default_roles_and_permissions()
-    create_default_users()
-    create_default_genres() 
-    create_default_books()
+    with startup_timer.phase("schema check"):
+        check_version(engine)
+    # seeding hashes passwords and writes demo data, outside of the seed mode
+    # it is left to `python manage.py seed`
+    if STARTUP_MODE == StartupMode.SEED:
+        with startup_timer.phase("seed"):
+            seed()
+    with startup_timer.phase("book availability"):
+        reconcile_book_availability()
+    with startup_timer.phase("genre index"):
+        load_genre_index()
+    with startup_timer.phase("suggestion index"):
+        load_suggestion_index()
+    with startup_timer.phase("curation documents"):
+        render_curation_documents()
+    with startup_timer.phase("schedule jobs"):
+        # only schedules the first run, the reminders go out after startup
+        await run_jobs()
 
-    await run_jobs()
+    app.state.startup_phases = dict(startup_timer.phases)
+    app.state.startup_ms = startup_timer.report()
     yield
+    hashing_service.shutdown()
 
 
 app = FastAPI(lifespan=lifespan)
 
-user_model.Base.metadata.create_all(engine)
-role_model.Base.metadata.create_all(engine)
-permission_model.Base.metadata.create_all(engine)
-user_role_association_model.Base.metadata.create_all(engine)
-role_permission_association_model.Base.metadata.create_all(engine)
-suspension_log_model.Base.metadata.create_all(engine)
-book_model.Base.metadata.create_all(engine)
-genre_model.Base.metadata.create_all(engine)
-book_genre_association_model.Base.metadata.create_all(engine)
-check_in_out_model.Base.metadata.create_all(engine)
-notification_model.Base.metadata.create_all(engine)
-faq_model.Base.metadata.create_all(engine)
-app_log_model.Base.metadata.create_all(engine)
-
-
 origins = os.getenv("ORIGINS", "").split(",")
 
 app.add_middleware(
@@ -10,9 +10,9 @@ import string
 from app.database.enums import UserRole
 
 from app.database.models.user import User
-from app.schemas.user import UserViewProfileData
+from ..helpers.principal_cache import Principal, auth_versions, principal_cache
 from ..repository import user as user_repository
-from ..database.base import SessionLocal
+from ..database.base import AsyncReadSessionLocal
 
 SECRET_KEY = os.getenv("SECRET_KEY", "")
 ALGORITHM = os.getenv("ALGORITHM", "")
@@ -25,161 +25,153 @@ oauth2_scheme = OAuth2PasswordBearer(
 optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/users/login", auto_error=False)
 
 
-def create_access_token(data: Union[str, Any], expires_delta: timedelta | None = None):
+def create_access_token(
+    data: Union[str, Any],
+    expires_delta: timedelta | None = None,
+    claims: dict | None = None,
+):
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(days=ACCESS_TOKEN_EXPIRE_DAYS)
-    to_encode = {"exp": expire, "sub": str(data)}
+    to_encode = {**(claims or {}), "exp": expire, "sub": str(data)}
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
-def verify_token(token: str, credentials_exception):
+MANAGER_ROLE_NAMES = {UserRole.PROPRIETOR.value, UserRole.LIBRARIAN.value}
+
+
+def get_credentials_exception():
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def decode_token(token: str, credentials_exception):
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        token_data: str = payload.get("sub")
-        if token_data is None:
-            raise credentials_exception
-        return token_data
     except JWTError:
         raise credentials_exception
+    if payload.get("sub") is None:
+        raise credentials_exception
+    return payload
+
+
+def verify_token(token: str, credentials_exception):
+    token_data: str = decode_token(token, credentials_exception)["sub"]
+    return token_data
+
+
+def get_token_user_id(token_data: str) -> str:
+    return json.loads(token_data.replace("'", '"'))["id"]
+
+
+def get_token_claims(user: User):
+    # authorization reads these instead of loading the user's roles
+    return {
+        "roles": [
+            user_role_association.role.name
+            for user_role_association in user.user_role_associations
+        ],
+        "auth_version": user.auth_version,
+    }
+
 
+def get_token_auth_version(payload: dict) -> int:
+    # tokens issued before auth_version existed count as the first version
+    return payload.get("auth_version", 0)
 
-def check_if_manager_user(user: User | None):
+
+def check_if_manager_user(user: Principal | None):
     if user is None:
         return False
 
-    return any(
-        (
-            user_role_association.role.name == UserRole.PROPRIETOR.value
-            or user_role_association.role.name == UserRole.LIBRARIAN.value
-        )
-        for user_role_association in user.user_role_associations
+    return user.is_manager_user
+
+
+async def get_principal(token: str, credentials_exception) -> Principal | None:
+    # a token seen before was already verified, its entry expires with it
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
+
+    payload = decode_token(token, credentials_exception)
+    user_id = get_token_user_id(payload["sub"])
+    cache_version = principal_cache.version
+    versions_version = auth_versions.version
+    auth_version = auth_versions.get(user_id)
+    role_names = payload.get("roles")
+    if auth_version is None or role_names is None:
+        async with AsyncReadSessionLocal() as db:
+            if auth_version is None:
+                auth_version = await user_repository.get_auth_version_async(
+                    user_id, db
+                )
+                if auth_version is None:
+                    return None
+                auth_versions.set(user_id, auth_version, versions_version)
+            if role_names is None:
+                # tokens issued before role claims existed
+                role_names = await user_repository.get_role_names_async(user_id, db)
+                if role_names is None:
+                    return None
+    if get_token_auth_version(payload) != auth_version:
+        raise credentials_exception
+
+    principal = Principal(
+        id=user_id,
+        role_names=frozenset(role_names),
+        is_manager_user=not MANAGER_ROLE_NAMES.isdisjoint(role_names),
     )
+    principal_cache.set(token, principal, cache_version, payload["exp"])
+    return principal
+
+
+async def get_principal_with_role(token: str, role_names: set) -> Principal:
+    credentials_exception = get_credentials_exception()
+    principal = await get_principal(token, credentials_exception)
+    if principal is None or principal.role_names.isdisjoint(role_names):
+        raise credentials_exception
+    return principal
 
 
 async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)]):
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    token_data = verify_token(token=token, credentials_exception=credentials_exception)
-    db = SessionLocal()
-    data = json.loads(token_data.replace("'", '"'))
-    user = user_repository.get_one(data["id"], db, True)
-    db.close()
-    if user is None:
+    # the profile and password routes need the whole user, so this one is not cached
+    credentials_exception = get_credentials_exception()
+    payload = decode_token(token, credentials_exception)
+    async with AsyncReadSessionLocal() as db:
+        user = await user_repository.get_one_async(
+            get_token_user_id(payload["sub"]), db, True
+        )
+    if user is None or user.auth_version != get_token_auth_version(payload):
         raise credentials_exception
     return user
 
 
 async def get_current_manager_user(token: Annotated[str, Depends(oauth2_scheme)]):
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    token_data = verify_token(token=token, credentials_exception=credentials_exception)
-    db = SessionLocal()
-    data = json.loads(token_data.replace("'", '"'))
-    user: UserViewProfileData = user_repository.get_one(data["id"], db, True)
-    db.close()
-
-    is_manager_user = check_if_manager_user(user)
-
-    if not is_manager_user:
-        raise credentials_exception
-    return user
+    return await get_principal_with_role(token, MANAGER_ROLE_NAMES)
 
 
 async def get_current_proprietor_user(token: Annotated[str, Depends(oauth2_scheme)]):
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    token_data = verify_token(token=token, credentials_exception=credentials_exception)
-    db = SessionLocal()
-    data = json.loads(token_data.replace("'", '"'))
-    user: UserViewProfileData = user_repository.get_one(data["id"], db, True)
-    db.close()
-    if user is None:
-        raise credentials_exception
-    is_proprietor_user = any(
-        (user_role_association.role.name == UserRole.PROPRIETOR.value)
-        for user_role_association in user.user_role_associations
-    )
-
-    if not is_proprietor_user:
-        raise credentials_exception
-    return user
+    return await get_principal_with_role(token, {UserRole.PROPRIETOR.value})
 
 
 async def get_current_librarian_user(token: Annotated[str, Depends(oauth2_scheme)]):
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    token_data = verify_token(token=token, credentials_exception=credentials_exception)
-    db = SessionLocal()
-    data = json.loads(token_data.replace("'", '"'))
-    user: UserViewProfileData = user_repository.get_one(data["id"], db, True)
-    db.close()
-    if user is None:
-        raise credentials_exception
-    is_librarian_user = any(
-        (user_role_association.role.name == UserRole.LIBRARIAN.value)
-        for user_role_association in user.user_role_associations
-    )
-
-    if not is_librarian_user:
-        raise credentials_exception
-    return user
+    return await get_principal_with_role(token, {UserRole.LIBRARIAN.value})
 
 
 async def get_current_borrower_user(token: Annotated[str, Depends(oauth2_scheme)]):
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    token_data = verify_token(token=token, credentials_exception=credentials_exception)
-    db = SessionLocal()
-    data = json.loads(token_data.replace("'", '"'))
-    user: UserViewProfileData = user_repository.get_one(data["id"], db, True)
-    db.close()
-    if user is None:
-        raise credentials_exception
-    is_borrower_user = any(
-        (user_role_association.role.name == UserRole.BORROWER.value)
-        for user_role_association in user.user_role_associations
-    )
-
-    if not is_borrower_user:
-        raise credentials_exception
-    return user
+    return await get_principal_with_role(token, {UserRole.BORROWER.value})
 
 
 async def get_current_user_or_none(
     token: Annotated[str, Depends(optional_oauth2_scheme)]
 ):
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
     if token:
-        token_data = verify_token(
-            token=token, credentials_exception=credentials_exception
-        )
-        db = SessionLocal()
-        data = json.loads(token_data.replace("'", '"'))
-        user = user_repository.get_one(data["id"], db, True)
-        db.close()
-        return user
+        return await get_principal(token, get_credentials_exception())
     return None
 
 
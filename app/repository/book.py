@@ -1,33 +1,228 @@
-from typing import List, Union
+import json
+import uuid
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Tuple, Union
 from fastapi import Depends, HTTPException, status
-from sqlalchemy import and_, func, or_
-from sqlalchemy.orm import Session
+from pydantic import ValidationError
+from sqlalchemy import (
+    and_,
+    func,
+    insert,
+    null,
+    select,
+    union_all,
+    update as sql_update,
+)
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 from ..database.models import book as book_models
-from ..database.base import get_db
+from ..database.base import get_async_db, get_db
 from ..schemas import user as user_schemas
 from ..schemas import book as book_schemas
-from ..database.models import check_in_out as check_in_out_models
+from ..database.models import book_availability as book_availability_models
 from datetime import datetime
-from ..database.models import genre as genre_model
 from ..database.models import book_genre_association as book_genre_association_model
+from ..database.models import genre as genre_model
+from ..database.enums import GenreMatchFilter, SearchMode
+from ..helpers import catalog_cache
+from ..helpers.genre_index import genre_index
+from ..helpers.suggestion_index import suggestion_index
+from ..utils.constants import (
+    EXPORT_BATCH_SIZE,
+    IMPORT_CHUNK_SIZE,
+    MAX_BOOK_GENRES_ASSOCIATIONS,
+)
+from ..helpers.pagination import decode_cursor, encode_cursor, paginate
+from . import book_availability as book_availability_repository
+from . import book_search as book_search_repository
+from . import curation_document as curation_document_repository
 
 
-def get_book_query_base(db: Session = Depends(get_db)):
-    return (
-        db.query(
-            book_models.Book,
-            func.count(check_in_out_models.CheckInOut.id).label("current_borrow_count"),
+def load_book_genres():
+    # batched SELECT ... IN per level instead of the models' eager joins
+    return selectinload(book_models.Book.genre_associations).selectinload(
+        book_genre_association_model.BookGenreAssociation.genre
+    )
+
+
+PUBLIC_BOOK_FIELDS = {
+    "id",
+    "title",
+    "author_name",
+    "description",
+    "img_url",
+    "created_at",
+    "updated_at",
+    "genre_associations",
+    "public_shelf_quantity",
+    "current_borrow_count",
+}
+PRIVATE_BOOK_FIELDS = PUBLIC_BOOK_FIELDS | {
+    "proprietor_id",
+    "total_quantity",
+    "private_shelf_quantity",
+}
+
+
+def parse_fields(fields: str | None, is_manager: bool = False):
+    if not fields:
+        return None
+    requested_fields = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown_fields = requested_fields - (
+        PRIVATE_BOOK_FIELDS if is_manager else PUBLIC_BOOK_FIELDS
+    )
+    if unknown_fields:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"unknown fields: {', '.join(sorted(unknown_fields))}",
         )
-        .join(
-            check_in_out_models.CheckInOut,
-            and_(
-                check_in_out_models.CheckInOut.book_id == book_models.Book.id,
-                check_in_out_models.CheckInOut.returned == False,
+    return requested_fields | {"id"}
+
+
+def get_book_query_base(db: Session = Depends(get_db), fields: set | None = None):
+    if fields is None:
+        columns = [book_models.Book]
+    else:
+        # only the requested columns, plus the ones pagination sorts on
+        columns = [
+            column
+            for column in book_models.Book.__table__.c
+            if column.name in fields or column.name in ("id", "updated_at")
+        ]
+    query = db.query(
+        *columns,
+        func.coalesce(book_availability_models.BookAvailability.borrowed_count, 0).label(
+            "current_borrow_count"
+        ),
+    ).join(
+        book_availability_models.BookAvailability,
+        book_availability_models.BookAvailability.book_id == book_models.Book.id,
+        isouter=True,
+    )
+    return query.options(load_book_genres()) if fields is None else query
+
+
+def filter_by_genres(
+    query,
+    genre_ids: Union[List[str], None],
+    genre_match: GenreMatchFilter = GenreMatchFilter.ANY,
+):
+    if genre_ids is None:
+        return query
+    match_all = genre_match == GenreMatchFilter.ALL
+
+    if genre_index.is_ready:
+        book_ids = genre_index.match(genre_ids, match_all)
+        # one json parameter instead of one bind per id
+        matching_books = func.json_each(json.dumps(book_ids)).table_valued("value")
+        return query.filter(book_models.Book.id.in_(select(matching_books.c.value)))
+
+    matching_books = select(
+        book_genre_association_model.BookGenreAssociation.book_id
+    ).filter(book_genre_association_model.BookGenreAssociation.genre_id.in_(genre_ids))
+    if match_all:
+        matching_books = matching_books.group_by(
+            book_genre_association_model.BookGenreAssociation.book_id
+        ).having(
+            func.count(
+                book_genre_association_model.BookGenreAssociation.genre_id.distinct()
+            )
+            == len(set(genre_ids))
+        )
+    return query.filter(book_models.Book.id.in_(matching_books))
+
+
+def get_facets(query, db: Session = Depends(get_db)):
+    # one pass over the matching books, materialized once for both aggregates
+    borrowed_count = func.coalesce(
+        book_availability_models.BookAvailability.borrowed_count, 0
+    )
+    matches = (
+        query.with_entities(
+            book_models.Book.id.label("book_id"),
+            (borrowed_count < book_models.Book.public_shelf_quantity).label(
+                "is_available"
             ),
-            isouter=True,
+            (book_models.Book.public_shelf_quantity > 0).label("is_public"),
+            (book_models.Book.private_shelf_quantity > 0).label("is_private"),
         )
-        .group_by(book_models.Book.id)
+        .order_by(None)
+        .cte("matches")
+        .prefix_with("MATERIALIZED")
     )
+    association = book_genre_association_model.BookGenreAssociation
+    genre_counts = (
+        select(
+            association.genre_id,
+            func.count(association.book_id.distinct()).label("count"),
+            null().label("available"),
+            null().label("public_shelf"),
+            null().label("private_shelf"),
+        )
+        .join_from(matches, association, association.book_id == matches.c.book_id)
+        .group_by(association.genre_id)
+    )
+    totals = select(
+        null().label("genre_id"),
+        func.count().label("count"),
+        func.coalesce(func.sum(matches.c.is_available), 0),
+        func.coalesce(func.sum(matches.c.is_public), 0),
+        func.coalesce(func.sum(matches.c.is_private), 0),
+    ).select_from(matches)
+
+    facets = {"genres": []}
+    for row in db.execute(union_all(genre_counts, totals)).all():
+        if row.genre_id is not None:
+            facets["genres"].append({"genre_id": row.genre_id, "count": row.count})
+            continue
+        facets.update(
+            {
+                "total": row.count,
+                "available": row.available,
+                "fully_borrowed": row.count - row.available,
+                "public_shelf": row.public_shelf,
+                "private_shelf": row.private_shelf,
+            }
+        )
+    facets["genres"].sort(key=lambda genre: (-genre["count"], genre["genre_id"]))
+    return facets
+
+
+def get_row_book(row):
+    # full rows carry a Book entity, projected rows carry its columns directly
+    return row.Book if "Book" in row._fields else row
+
+
+def to_book_dicts(rows, fields: set | None, db: Session = Depends(get_db)):
+    if fields is None:
+        return [
+            {
+                **row._asdict()["Book"].__dict__,
+                "current_borrow_count": row._asdict()["current_borrow_count"],
+            }
+            for row in rows
+        ]
+
+    books = [
+        {key: value for key, value in row._asdict().items() if key in fields}
+        for row in rows
+    ]
+    if "genre_associations" in fields and books:
+        genre_associations = {book["id"]: [] for book in books}
+        for association in (
+            db.query(book_genre_association_model.BookGenreAssociation)
+            .filter(
+                book_genre_association_model.BookGenreAssociation.book_id.in_(
+                    genre_associations
+                )
+            )
+            .all()
+        ):
+            genre_associations[association.book_id].append(association)
+        for book in books:
+            book["genre_associations"] = genre_associations[book["id"]]
+    return books
 
 
 def count_all(db: Session = Depends(get_db)):
@@ -38,45 +233,114 @@ def get_all(
     current_user: Union[user_schemas.User, None],
     genre_ids: Union[List[str], None],
     db: Session = Depends(get_db),
+    cursor: str | None = None,
+    limit: int | None = None,
+    genre_match: GenreMatchFilter = GenreMatchFilter.ANY,
+    include_facets: bool = False,
+    fields: set | None = None,
 ):
-    query_base = get_book_query_base(db).order_by(book_models.Book.updated_at.desc())
-    query = (
-        query_base.join(book_genre_association_model.BookGenreAssociation)
-        .join(genre_model.Genre)
-        .filter(genre_model.Genre.id.in_(genre_ids))
-        if genre_ids is not None
-        else query_base
+    query_base = get_book_query_base(db, fields).order_by(
+        book_models.Book.updated_at.desc(), book_models.Book.id.desc()
     )
+    query = filter_by_genres(query_base, genre_ids, genre_match)
 
     if current_user is None:
-        user_books = query.filter(book_models.Book.public_shelf_quantity > 0).all()
+        query = query.filter(book_models.Book.public_shelf_quantity > 0)
 
-        books = [
-            {
-                **row._asdict()["Book"].__dict__,
-                "current_borrow_count": row._asdict()["current_borrow_count"],
-            }
-            for row in user_books
-        ]
+    # NOTE: this is how to join and select
+    # librarian_and_proprietor_books: List[
+    #     book_schemas.ShowBookPrivate
+    # ] = query.options(
+    #     joinedload(
+    #         book_models.Book.check_in_outs,
+    #     ),
+    # ).all()
+    rows, next_cursor = paginate(
+        query,
+        [book_models.Book.updated_at, book_models.Book.id],
+        lambda row: [get_row_book(row).updated_at, get_row_book(row).id],
+        cursor,
+        limit,
+    )
+    books = to_book_dicts(rows, fields, db)
+    facets = get_facets(query, db) if include_facets else None
+    return books, next_cursor, facets
 
-    else:
-        # NOTE: this is how to join and select
-        # librarian_and_proprietor_books: List[
-        #     book_schemas.ShowBookPrivate
-        # ] = query.options(
-        #     joinedload(
-        #         book_models.Book.check_in_outs,
-        #     ),
-        # ).all()
-        librarian_and_proprietor_books = query.all()
-        books = [
-            {
-                **row._asdict()["Book"].__dict__,
-                "current_borrow_count": row._asdict()["current_borrow_count"],
-            }
-            for row in librarian_and_proprietor_books
-        ]
-    return books
+
+async def get_all_async(
+    current_user: Union[user_schemas.User, None],
+    genre_ids: Union[List[str], None],
+    db: AsyncSession = Depends(get_async_db),
+    cursor: str | None = None,
+    limit: int | None = None,
+    genre_match: GenreMatchFilter = GenreMatchFilter.ANY,
+    include_facets: bool = False,
+    fields: set | None = None,
+):
+    # the listing queries run as they are, over the async connection
+    return await db.run_sync(
+        lambda session: get_all(
+            current_user,
+            genre_ids,
+            session,
+            cursor,
+            limit,
+            genre_match,
+            include_facets,
+            fields,
+        )
+    )
+
+
+EXPORT_COLUMNS = [
+    "id",
+    "proprietor_id",
+    "title",
+    "author_name",
+    "description",
+    "img_url",
+    "total_quantity",
+    "public_shelf_quantity",
+    "private_shelf_quantity",
+    "current_borrow_count",
+    "genre_ids",
+    "created_at",
+    "updated_at",
+]
+
+
+def get_export_rows(db: Session = Depends(get_db)):
+    association = book_genre_association_model.BookGenreAssociation
+    genre_ids = (
+        select(func.group_concat(association.genre_id, ","))
+        .where(association.book_id == book_models.Book.id)
+        .scalar_subquery()
+    )
+    statement = (
+        select(
+            *(
+                getattr(book_models.Book, column)
+                for column in EXPORT_COLUMNS
+                if hasattr(book_models.Book, column)
+            ),
+            func.coalesce(
+                book_availability_models.BookAvailability.borrowed_count, 0
+            ).label("current_borrow_count"),
+            genre_ids.label("genre_ids"),
+        )
+        .join(
+            book_availability_models.BookAvailability,
+            book_availability_models.BookAvailability.book_id == book_models.Book.id,
+            isouter=True,
+        )
+        .order_by(book_models.Book.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    # rows are fetched from the cursor batch by batch, never all at once
+    for row in db.execute(statement):
+        book = row._asdict()
+        book["genre_ids"] = book["genre_ids"].split(",") if book["genre_ids"] else []
+        yield {column: book[column] for column in EXPORT_COLUMNS}
 
 
 def get_one(
@@ -102,52 +366,140 @@ def get_one(
     }
 
 
+async def get_one_async(
+    id: str,
+    current_user: Union[user_schemas.User, None],
+    db: AsyncSession = Depends(get_async_db),
+):
+    statement = (
+        select(
+            book_models.Book,
+            func.coalesce(
+                book_availability_models.BookAvailability.borrowed_count, 0
+            ).label("current_borrow_count"),
+        )
+        .join(
+            book_availability_models.BookAvailability,
+            book_availability_models.BookAvailability.book_id == book_models.Book.id,
+            isouter=True,
+        )
+        .options(load_book_genres())
+        .filter(book_models.Book.id == id)
+    )
+    if current_user is None:
+        statement = statement.filter(book_models.Book.public_shelf_quantity > 0)
+
+    book = (await db.execute(statement)).first()
+    if not book:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=f"book {id} not available"
+        )
+    return {**book.Book.__dict__, "current_borrow_count": book.current_borrow_count}
+
+
 def search(
     current_user: Union[user_schemas.User, None],
     search_string: str,
     genre_ids: Union[List[str], None],
     db: Session = Depends(get_db),
+    cursor: str | None = None,
+    limit: int | None = None,
+    genre_match: GenreMatchFilter = GenreMatchFilter.ANY,
+    mode: SearchMode = SearchMode.FULL_TEXT,
+    include_facets: bool = False,
+    fields: set | None = None,
 ):
-    query_base = (
-        get_book_query_base(db)
-        .order_by(book_models.Book.updated_at.desc())
-        .filter(
-            or_(
-                book_models.Book.title.ilike(f"%{search_string}%"),
-                book_models.Book.author_name.ilike(f"%{search_string}%"),
-                book_models.Book.description.ilike(f"%{search_string}%"),
-            )
+    if mode == SearchMode.FUZZY:
+        return fuzzy_search(
+            current_user,
+            search_string,
+            genre_ids,
+            db,
+            cursor,
+            limit,
+            genre_match,
+            include_facets,
+            fields,
         )
-    )
 
-    query = (
-        query_base.join(book_genre_association_model.BookGenreAssociation)
-        .join(genre_model.Genre)
-        .filter(genre_model.Genre.id.in_(genre_ids))
-        if genre_ids is not None
-        else query_base
+    match_expression = book_search_repository.build_match_expression(search_string)
+    if match_expression:
+        matches = book_search_repository.get_matches(match_expression)
+        query_base = (
+            get_book_query_base(db, fields)
+            .add_columns(matches.c.rank)
+            .join(matches, matches.c.book_id == book_models.Book.id)
+            .order_by(matches.c.rank, book_models.Book.id)
+        )
+        sort_columns = [matches.c.rank, book_models.Book.id]
+        get_sort_values = lambda row: [row.rank, get_row_book(row).id]
+        descending = False
+    else:
+        query_base = get_book_query_base(db, fields).order_by(
+            book_models.Book.updated_at.desc(), book_models.Book.id.desc()
+        )
+        sort_columns = [book_models.Book.updated_at, book_models.Book.id]
+        get_sort_values = lambda row: [
+            get_row_book(row).updated_at,
+            get_row_book(row).id,
+        ]
+        descending = True
+
+    query = filter_by_genres(query_base, genre_ids, genre_match)
+
+    if current_user is None:
+        query = query.filter(book_models.Book.public_shelf_quantity > 0)
+
+    rows, next_cursor = paginate(
+        query, sort_columns, get_sort_values, cursor, limit, descending
     )
+    books = to_book_dicts(rows, fields, db)
+    facets = get_facets(query, db) if include_facets else None
+    return books, next_cursor, facets
+
 
+def fuzzy_search(
+    current_user: Union[user_schemas.User, None],
+    search_string: str,
+    genre_ids: Union[List[str], None],
+    db: Session = Depends(get_db),
+    cursor: str | None = None,
+    limit: int | None = None,
+    genre_match: GenreMatchFilter = GenreMatchFilter.ANY,
+    include_facets: bool = False,
+    fields: set | None = None,
+):
+    scores = book_search_repository.get_fuzzy_matches(search_string, db)
+    candidate_ids = func.json_each(json.dumps(list(scores))).table_valued("value")
+    query = filter_by_genres(
+        get_book_query_base(db, fields).filter(
+            book_models.Book.id.in_(select(candidate_ids.c.value))
+        ),
+        genre_ids,
+        genre_match,
+    )
     if current_user is None:
-        user_books = query.filter(book_models.Book.public_shelf_quantity > 0).all()
-        books = [
-            {
-                **row._asdict()["Book"].__dict__,
-                "current_borrow_count": row._asdict()["current_borrow_count"],
-            }
-            for row in user_books
-        ]
+        query = query.filter(book_models.Book.public_shelf_quantity > 0)
 
-    else:
-        librarian_and_proprietor_books = query.all()
-        books = [
-            {
-                **row._asdict()["Book"].__dict__,
-                "current_borrow_count": row._asdict()["current_borrow_count"],
-            }
-            for row in librarian_and_proprietor_books
-        ]
-    return books
+    facets = get_facets(query, db) if include_facets else None
+    # candidates are bounded, so ranking and paging happen in memory
+    get_sort_key = lambda row: (
+        -scores[get_row_book(row).id],
+        get_row_book(row).id,
+    )
+    rows = sorted(query.all(), key=get_sort_key)
+    if cursor:
+        score, id = decode_cursor(cursor, ["score", "id"])
+        rows = [row for row in rows if get_sort_key(row) > (-score, id)]
+
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        last_id = get_row_book(rows[-1]).id
+        next_cursor = encode_cursor([scores[last_id], last_id])
+
+    books = to_book_dicts(rows, fields, db)
+    return books, next_cursor, facets
 
 
 def create(
@@ -164,16 +516,153 @@ def create(
         private_shelf_quantity=req_body.private_shelf_quantity,
     )
     db.add(new_book)
+    db.flush()
+    book_search_repository.index_books([new_book], db)
     db.commit()
+    catalog_cache.invalidate_books()
     db.refresh(new_book)
+    suggestion_index.set_book(
+        new_book.id,
+        new_book.title,
+        new_book.author_name,
+        new_book.public_shelf_quantity > 0,
+    )
     return new_book
 
 
+def import_books(
+    rows: Iterable[Tuple[int, Dict[str, Any] | str]],
+    user_id: str,
+    db: Session = Depends(get_db),
+):
+    genre_ids = {}
+    for genre in db.query(genre_model.Genre.id, genre_model.Genre.name).all():
+        genre_ids[genre.id] = genre.id
+        genre_ids[genre.name.lower()] = genre.id
+
+    imported = 0
+    errors = []
+    rows = iter(rows)
+    while chunk := list(islice(rows, IMPORT_CHUNK_SIZE)):
+        new_books = []
+        new_associations = []
+        chunk_row_numbers = []
+        for row_number, row in chunk:
+            if isinstance(row, str):
+                errors.append({"row": row_number, "detail": row})
+                continue
+            try:
+                book = book_schemas.ImportBook.model_validate(row)
+            except ValidationError as exception:
+                detail = "; ".join(
+                    f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+                    for error in exception.errors()
+                )
+                errors.append({"row": row_number, "detail": detail})
+                continue
+
+            book_genre_ids = set()
+            unknown_genres = []
+            for genre in book.genres:
+                genre_id = genre_ids.get(genre) or genre_ids.get(genre.lower())
+                if genre_id is None:
+                    unknown_genres.append(genre)
+                else:
+                    book_genre_ids.add(genre_id)
+            if unknown_genres:
+                errors.append(
+                    {
+                        "row": row_number,
+                        "detail": f"unknown genres: {', '.join(unknown_genres)}",
+                    }
+                )
+                continue
+            if len(book_genre_ids) > MAX_BOOK_GENRES_ASSOCIATIONS:
+                errors.append(
+                    {
+                        "row": row_number,
+                        "detail": f"book cannot not have more than {MAX_BOOK_GENRES_ASSOCIATIONS} genres",
+                    }
+                )
+                continue
+
+            now = datetime.utcnow()
+            book_id = str(uuid.uuid4())
+            new_books.append(
+                {
+                    "id": book_id,
+                    "proprietor_id": user_id,
+                    "title": book.title,
+                    "author_name": book.author_name,
+                    "description": book.description,
+                    "img_url": str(book.img_url),
+                    "total_quantity": book.public_shelf_quantity
+                    + book.private_shelf_quantity,
+                    "public_shelf_quantity": book.public_shelf_quantity,
+                    "private_shelf_quantity": book.private_shelf_quantity,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+            )
+            new_associations.extend(
+                {"id": str(uuid.uuid4()), "book_id": book_id, "genre_id": genre_id}
+                for genre_id in book_genre_ids
+            )
+            chunk_row_numbers.append(row_number)
+
+        if not new_books:
+            continue
+        # one transaction and one executemany per table for the whole chunk
+        try:
+            db.execute(insert(book_models.Book), new_books)
+            if new_associations:
+                db.execute(
+                    insert(book_genre_association_model.BookGenreAssociation),
+                    new_associations,
+                )
+            book_search_repository.add_books(
+                [{"book_id": book["id"], **book} for book in new_books], db
+            )
+            db.commit()
+        except SQLAlchemyError as exception:
+            db.rollback()
+            # only DBAPIError wraps a driver error, report anything else as is
+            reason = getattr(exception, "orig", exception)
+            errors.extend(
+                {"row": row_number, "detail": f"could not be saved: {reason}"}
+                for row_number in chunk_row_numbers
+            )
+            continue
+
+        imported += len(new_books)
+        genre_index.add(
+            (association["book_id"], association["genre_id"])
+            for association in new_associations
+        )
+        suggestion_index.add_associations(
+            (association["book_id"], association["genre_id"])
+            for association in new_associations
+        )
+        for book in new_books:
+            suggestion_index.set_book(
+                book["id"],
+                book["title"],
+                book["author_name"],
+                book["public_shelf_quantity"] > 0,
+            )
+
+    if imported:
+        catalog_cache.invalidate_books()
+    return imported, errors
+
+
 def get_proprietor_book(id: str, proprietor_id: str, db: Session = Depends(get_db)):
     book = (
         get_book_query_base(db)
         .order_by(book_models.Book.updated_at.desc())
-        .filter_by(id=id, proprietor_id=proprietor_id)
+        .filter(
+            book_models.Book.id == id, book_models.Book.proprietor_id == proprietor_id
+        )
         .first()
     )
     if not book:
@@ -191,7 +680,7 @@ def get_proprietor_books(
 ):
     query = (
         get_book_query_base(db)
-        .filter_by(proprietor_id=current_user.id)
+        .filter(book_models.Book.proprietor_id == current_user.id)
         .order_by(book_models.Book.updated_at.desc())
     )
 
@@ -219,7 +708,100 @@ def update(id, update_data: dict, db: Session = Depends(get_db)):
                 continue
             setattr(book, key, str(value) if key == "img_url" else value)
     setattr(book, "updated_at", datetime.utcnow())
+    book_search_repository.index_books([book], db)
     db.commit()
+    suggestion_index.set_book(
+        book.id, book.title, book.author_name, book.public_shelf_quantity > 0
+    )
+    curation_document_repository.render_for_books([id], db)
+    catalog_cache.invalidate_book_details()
+
+
+def update_quantities(
+    updates: List[book_schemas.EditBookQuantity], db: Session = Depends(get_db)
+):
+    ids = [book_update.id for book_update in updates]
+    if len(set(ids)) != len(ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="each book can only be updated once per request",
+        )
+
+    # current quantities and borrow counts of every book in one query
+    requested_ids = func.json_each(json.dumps(ids)).table_valued("value")
+    books = {
+        row.id: row
+        for row in db.query(
+            book_models.Book.id,
+            book_models.Book.title,
+            book_models.Book.author_name,
+            book_models.Book.public_shelf_quantity,
+            book_models.Book.private_shelf_quantity,
+            func.coalesce(
+                book_availability_models.BookAvailability.borrowed_count, 0
+            ).label("current_borrow_count"),
+        )
+        .join(
+            book_availability_models.BookAvailability,
+            book_availability_models.BookAvailability.book_id == book_models.Book.id,
+            isouter=True,
+        )
+        .filter(book_models.Book.id.in_(select(requested_ids.c.value)))
+        .all()
+    }
+    missing_ids = [id for id in ids if id not in books]
+    if missing_ids:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"books {', '.join(missing_ids)} not available",
+        )
+
+    now = datetime.utcnow()
+    new_quantities = []
+    over_borrowed_ids = []
+    for book_update in updates:
+        book = books[book_update.id]
+        public_shelf_quantity = (
+            book.public_shelf_quantity
+            if book_update.public_shelf_quantity is None
+            else book_update.public_shelf_quantity
+        )
+        private_shelf_quantity = (
+            book.private_shelf_quantity
+            if book_update.private_shelf_quantity is None
+            else book_update.private_shelf_quantity
+        )
+        if public_shelf_quantity < book.current_borrow_count:
+            over_borrowed_ids.append(book.id)
+            continue
+        new_quantities.append(
+            {
+                "id": book.id,
+                "public_shelf_quantity": public_shelf_quantity,
+                "private_shelf_quantity": private_shelf_quantity,
+                "total_quantity": public_shelf_quantity + private_shelf_quantity,
+                "updated_at": now,
+            }
+        )
+    if over_borrowed_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"books {', '.join(over_borrowed_ids)} have more borrowed copies than their public shelf quantity",
+        )
+
+    db.execute(sql_update(book_models.Book), new_quantities)
+    db.commit()
+    for quantities in new_quantities:
+        book = books[quantities["id"]]
+        suggestion_index.set_book(
+            book.id,
+            book.title,
+            book.author_name,
+            quantities["public_shelf_quantity"] > 0,
+        )
+    curation_document_repository.render_for_books(books, db)
+    catalog_cache.invalidate_book_details()
+    return len(new_quantities)
 
 
 def destroy(id, db: Session = Depends(get_db)):
@@ -229,4 +811,10 @@ def destroy(id, db: Session = Depends(get_db)):
             status_code=status.HTTP_404_NOT_FOUND, detail=f"book {id} not available"
         )
     book.delete(synchronize_session=False)
+    book_search_repository.remove_books([id], db)
+    book_availability_repository.destroy(id, db)
     db.commit()
+    genre_index.remove_book(id)
+    suggestion_index.remove_book(id)
+    curation_document_repository.render_for_books([id], db)
+    catalog_cache.invalidate_book_details()
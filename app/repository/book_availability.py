@@ -0,0 +1,64 @@
+from datetime import datetime
+from fastapi import Depends
+from sqlalchemy import delete, func, insert, literal, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from ..database.base import get_db
+from ..database.models import book_availability as book_availability_models
+from ..database.models import check_in_out as check_in_out_models
+
+
+def increment_borrowed_count(book_id: str, db: Session = Depends(get_db)):
+    now = datetime.utcnow()
+    borrowed_count = book_availability_models.BookAvailability.borrowed_count
+    db.execute(
+        sqlite_insert(book_availability_models.BookAvailability)
+        .values(book_id=book_id, borrowed_count=1, updated_at=now)
+        .on_conflict_do_update(
+            index_elements=[book_availability_models.BookAvailability.book_id],
+            set_={"borrowed_count": borrowed_count + 1, "updated_at": now},
+        )
+    )
+
+
+def decrement_borrowed_count(book_id: str, db: Session = Depends(get_db)):
+    borrowed_count = book_availability_models.BookAvailability.borrowed_count
+    db.execute(
+        update(book_availability_models.BookAvailability)
+        .where(
+            book_availability_models.BookAvailability.book_id == book_id,
+            borrowed_count > 0,
+        )
+        .values(borrowed_count=borrowed_count - 1, updated_at=datetime.utcnow())
+    )
+
+
+def destroy(book_id: str, db: Session = Depends(get_db)):
+    db.execute(
+        delete(book_availability_models.BookAvailability).where(
+            book_availability_models.BookAvailability.book_id == book_id
+        )
+    )
+
+
+def is_empty(db: Session = Depends(get_db)):
+    return db.query(book_availability_models.BookAvailability).first() is None
+
+
+def reconcile(db: Session = Depends(get_db)):
+    db.execute(delete(book_availability_models.BookAvailability))
+    result = db.execute(
+        insert(book_availability_models.BookAvailability).from_select(
+            ["book_id", "borrowed_count", "updated_at"],
+            select(
+                check_in_out_models.CheckInOut.book_id,
+                func.count(check_in_out_models.CheckInOut.id),
+                literal(datetime.utcnow()),
+            )
+            .filter(check_in_out_models.CheckInOut.returned == False)
+            .group_by(check_in_out_models.CheckInOut.book_id),
+        )
+    )
+    db.commit()
+    return result.rowcount
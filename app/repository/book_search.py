@@ -0,0 +1,154 @@
+import re
+from typing import List
+from fastapi import Depends
+from sqlalchemy import column, delete, func, insert, literal_column, select, table
+from sqlalchemy.orm import Session
+
+from ..database.base import get_db
+from ..utils.constants import (
+    FUZZY_SEARCH_CANDIDATE_LIMIT,
+    FUZZY_SEARCH_SIMILARITY_THRESHOLD,
+)
+
+BOOK_SEARCH_TABLE = "book_search"
+BOOK_TRIGRAM_TABLE = "book_trigram"
+
+book_search = table(
+    BOOK_SEARCH_TABLE,
+    column("book_id"),
+    column("title"),
+    column("author_name"),
+    column("description"),
+)
+
+book_trigram = table(
+    BOOK_TRIGRAM_TABLE,
+    column("book_id"),
+    column("title"),
+    column("author_name"),
+)
+
+# bm25 column weights: book_id, title, author_name, description
+BOOK_SEARCH_WEIGHTS = (0.0, 10.0, 5.0, 1.0)
+
+
+def build_match_expression(search_string: str | None):
+    terms = re.findall(r"\w+", (search_string or "").lower())
+    # every term must match as a word prefix, so partly typed words still find books
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def get_matches(match_expression: str):
+    return (
+        select(
+            book_search.c.book_id,
+            func.bm25(literal_column(BOOK_SEARCH_TABLE), *BOOK_SEARCH_WEIGHTS).label(
+                "rank"
+            ),
+        )
+        .where(literal_column(BOOK_SEARCH_TABLE).op("MATCH")(match_expression))
+        # keep sqlite from flattening bm25() out of its MATCH query
+        .cte()
+        .prefix_with("MATERIALIZED")
+    )
+
+
+def get_trigrams(value: str | None):
+    trigrams = set()
+    for word in re.findall(r"\w+", (value or "").lower()):
+        padded_word = f"  {word} "
+        trigrams.update(
+            padded_word[index : index + 3] for index in range(len(padded_word) - 2)
+        )
+    return trigrams
+
+
+def get_similarity(first: set, second: set):
+    if not first or not second:
+        return 0.0
+    return len(first & second) / len(first | second)
+
+
+def get_fuzzy_matches(search_string: str | None, db: Session = Depends(get_db)):
+    # the trigram index only narrows the candidates, similarity decides the match
+    words = re.findall(r"\w+", (search_string or "").lower())
+    query_trigrams = {
+        word[index : index + 3]
+        for word in words
+        for index in range(len(word) - 2)
+    }
+    if not query_trigrams:
+        return {}
+
+    # quoted as FTS5 strings so no trigram is read as query syntax
+    match_expression = " OR ".join(
+        '"' + trigram.replace('"', '""') + '"' for trigram in query_trigrams
+    )
+    candidates = db.execute(
+        select(book_trigram.c.book_id, book_trigram.c.title, book_trigram.c.author_name)
+        .where(literal_column(BOOK_TRIGRAM_TABLE).op("MATCH")(match_expression))
+        .order_by(literal_column("rank"))
+        .limit(FUZZY_SEARCH_CANDIDATE_LIMIT)
+    ).all()
+
+    search_trigrams = get_trigrams(search_string)
+    scores = {}
+    for candidate in candidates:
+        score = max(
+            get_similarity(search_trigrams, get_trigrams(candidate.title)),
+            get_similarity(search_trigrams, get_trigrams(candidate.author_name)),
+        )
+        if score >= FUZZY_SEARCH_SIMILARITY_THRESHOLD:
+            scores[candidate.book_id] = round(score, 6)
+    return scores
+
+
+def index_books(books: List, db: Session = Depends(get_db)):
+    if not books:
+        return
+    remove_books([book.id for book in books], db)
+    add_books(
+        [
+            {
+                "book_id": book.id,
+                "title": book.title,
+                "author_name": book.author_name,
+                "description": book.description,
+            }
+            for book in books
+        ],
+        db,
+    )
+
+
+def add_books(rows: List[dict], db: Session = Depends(get_db)):
+    if not rows:
+        return
+    db.execute(
+        insert(book_search),
+        [
+            {
+                "book_id": row["book_id"],
+                "title": row["title"],
+                "author_name": row["author_name"],
+                "description": row["description"] or "",
+            }
+            for row in rows
+        ],
+    )
+    db.execute(
+        insert(book_trigram),
+        [
+            {
+                "book_id": row["book_id"],
+                "title": row["title"],
+                "author_name": row["author_name"],
+            }
+            for row in rows
+        ],
+    )
+
+
+def remove_books(ids: List[str], db: Session = Depends(get_db)):
+    db.execute(delete(book_search).where(book_search.c.book_id.in_(ids)))
+    db.execute(delete(book_trigram).where(book_trigram.c.book_id.in_(ids)))
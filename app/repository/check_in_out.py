@@ -1,26 +1,53 @@
 from fastapi import Depends, HTTPException, status
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
 from ..database.models import check_in_out as check_in_out_models
+from .book import load_book_genres
 from ..database.base import get_db
 from ..schemas import user as user_schemas
 from ..schemas import check_in_out as check_in_out_schemas
 from sqlalchemy import and_
+from ..helpers import catalog_cache
+from ..helpers.pagination import paginate
+from ..helpers.suggestion_index import suggestion_index
+from . import book_availability as book_availability_repository
 
 
-def get_all(db: Session = Depends(get_db)):
-    return (
-        db.query(check_in_out_models.CheckInOut)
-        .order_by(check_in_out_models.CheckInOut.updated_at.desc())
-        .all()
+def get_check_in_out_query_base(db: Session = Depends(get_db)):
+    return db.query(check_in_out_models.CheckInOut).options(
+        selectinload(check_in_out_models.CheckInOut.book).options(load_book_genres())
+    )
+
+
+def paginate_check_in_outs(query, cursor: str | None, limit: int | None):
+    return paginate(
+        query.order_by(
+            check_in_out_models.CheckInOut.updated_at.desc(),
+            check_in_out_models.CheckInOut.id.desc(),
+        ),
+        [
+            check_in_out_models.CheckInOut.updated_at,
+            check_in_out_models.CheckInOut.id,
+        ],
+        lambda check_in_out: [check_in_out.updated_at, check_in_out.id],
+        cursor,
+        limit,
+    )
+
+
+def get_all(
+    db: Session = Depends(get_db), cursor: str | None = None, limit: int | None = None
+):
+    return paginate_check_in_outs(
+        get_check_in_out_query_base(db), cursor, limit
     )
 
 
 def get_one(
     id: str, db: Session = Depends(get_db), ignore_not_found_exception: bool = False
 ):
-    check_in_out = db.query(check_in_out_models.CheckInOut).filter(check_in_out_models.CheckInOut.id == id).first()
+    check_in_out = get_check_in_out_query_base(db).filter(check_in_out_models.CheckInOut.id == id).first()
     if not check_in_out and not ignore_not_found_exception:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail=f"borrowed book {id} not available"
@@ -29,7 +56,7 @@ def get_one(
 
 def get_all_by_user(current_user: user_schemas.User, db: Session = Depends(get_db)):
     return (
-        db.query(check_in_out_models.CheckInOut)
+        get_check_in_out_query_base(db)
         .filter_by(borrower_id=current_user.id)
         .order_by(check_in_out_models.CheckInOut.updated_at.desc())
         .all()
@@ -40,7 +67,7 @@ def get_all_check_outs_by_user(
     current_user: user_schemas.User, db: Session = Depends(get_db)
 ):
     return (
-        db.query(check_in_out_models.CheckInOut)
+        get_check_in_out_query_base(db)
         .filter(
             and_(
                 check_in_out_models.CheckInOut.borrower_id == current_user.id,
@@ -56,7 +83,7 @@ def get_one_by_user(
     id: str, current_user: user_schemas.User, db: Session = Depends(get_db)
 ):
     return (
-        db.query(check_in_out_models.CheckInOut)
+        get_check_in_out_query_base(db)
         .filter(
             and_(
                 check_in_out_models.CheckInOut.id == id,
@@ -79,14 +106,17 @@ def check_out_book(
         due_at=datetime.utcnow() + timedelta(days=45),
     )
     db.add(new_check_in_out)
+    book_availability_repository.increment_borrowed_count(req_body.book_id, db)
     db.commit()
+    catalog_cache.invalidate_books()
+    suggestion_index.record_borrow(req_body.book_id)
     db.refresh(new_check_in_out)
     return new_check_in_out
 
 
 def check_in_book(id: str, user_id: str, db: Session = Depends(get_db)):
     check_in_out = (
-        db.query(check_in_out_models.CheckInOut)
+        get_check_in_out_query_base(db)
         .filter(
             and_(
                 check_in_out_models.CheckInOut.id == id,
@@ -101,10 +131,15 @@ def check_in_book(id: str, user_id: str, db: Session = Depends(get_db)):
             detail=f"check in\\out {id} not available",
         )
 
+    if not check_in_out.returned:
+        book_availability_repository.decrement_borrowed_count(
+            check_in_out.book_id, db
+        )
     setattr(check_in_out, "returned", True)
     setattr(check_in_out, "returned_at", datetime.utcnow())
     setattr(check_in_out, "updated_at", datetime.utcnow())
     db.commit()
+    catalog_cache.invalidate_books()
 
     db.refresh(check_in_out)
     return check_in_out
@@ -112,27 +147,37 @@ def check_in_book(id: str, user_id: str, db: Session = Depends(get_db)):
 
 def destroy(id, db: Session = Depends(get_db)):
     check_in_out = db.query(check_in_out_models.CheckInOut).filter_by(id=id)
-    if not check_in_out.first():
+    existing_check_in_out = check_in_out.first()
+    if not existing_check_in_out:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail=f"book {id} not available"
         )
+    if not existing_check_in_out.returned:
+        book_availability_repository.decrement_borrowed_count(
+            existing_check_in_out.book_id, db
+        )
     check_in_out.delete(synchronize_session=False)
     db.commit()
+    catalog_cache.invalidate_books()
 
 
-def get_all_due_soon_books(due_time: datetime, db: Session = Depends(get_db)):
+def get_all_due_soon_books(
+    due_time: datetime,
+    db: Session = Depends(get_db),
+    cursor: str | None = None,
+    limit: int | None = None,
+):
     today = datetime.utcnow()
 
     # Query for CheckInOut objects where due_at is between today and 10 days from today
     books_due = (
-        db.query(check_in_out_models.CheckInOut)
+        get_check_in_out_query_base(db)
         .filter(check_in_out_models.CheckInOut.due_at >= today)
         .filter(check_in_out_models.CheckInOut.due_at <= due_time)
         .filter(check_in_out_models.CheckInOut.returned == False)
-        .all()
     )
 
-    return books_due
+    return paginate_check_in_outs(books_due, cursor, limit)
 
 
 def get_due_soon_books_by_user(
@@ -142,7 +187,7 @@ def get_due_soon_books_by_user(
 
     # Query for CheckInOut objects where due_at is between today and 10 days from today
     books_due = (
-        db.query(check_in_out_models.CheckInOut)
+        get_check_in_out_query_base(db)
         .filter(check_in_out_models.CheckInOut.due_at >= today)
         .filter(check_in_out_models.CheckInOut.due_at <= due_time)
         .filter(check_in_out_models.CheckInOut.returned == False)
@@ -155,18 +200,19 @@ def get_due_soon_books_by_user(
     return books_due
 
 
-def get_all_late_books(db: Session = Depends(get_db)):
+def get_all_late_books(
+    db: Session = Depends(get_db), cursor: str | None = None, limit: int | None = None
+):
     today = datetime.utcnow()
 
     # Query for CheckInOut objects where due_at is between today and 10 days from today
     books_due = (
-        db.query(check_in_out_models.CheckInOut)
+        get_check_in_out_query_base(db)
         .filter(check_in_out_models.CheckInOut.due_at <= today)
         .filter(check_in_out_models.CheckInOut.returned == False)
-        .all()
     )
 
-    return books_due
+    return paginate_check_in_outs(books_due, cursor, limit)
 
 
 def get_late_books_by_user(
@@ -176,7 +222,7 @@ def get_late_books_by_user(
 
     # Query for CheckInOut objects where due_at is between today and 10 days from today
     books_due = (
-        db.query(check_in_out_models.CheckInOut)
+        get_check_in_out_query_base(db)
         .filter(check_in_out_models.CheckInOut.due_at <= today)
         .filter(check_in_out_models.CheckInOut.returned == False)
         .filter(
@@ -1,22 +1,25 @@
 from fastapi import Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
 from app.repository.authentication import check_if_manager_user
 
+from ..database.models import book_curation_association as book_curation_association_model
 from ..database.models import curation as curation_model
 from ..schemas import curation as curation_schemas
 from ..database.base import get_db
+from ..helpers import catalog_cache
+from .book import load_book_genres
+from . import curation_document as curation_document_repository
 from datetime import datetime
 
 
-def get_all(current_user, db: Session = Depends(get_db)):
-    query = db.query(
-        curation_model.Curation,
+def get_curation_query_base(db: Session = Depends(get_db)):
+    # a fixed number of batched queries however many curations and books
+    return db.query(curation_model.Curation).options(
+        selectinload(curation_model.Curation.curation_associations)
+        .selectinload(book_curation_association_model.BookCurationAssociation.book)
+        .options(load_book_genres())
     )
-    if check_if_manager_user(current_user):
-        return query.all()
-    else:
-        return query.filter_by(published=True).all()
 
 
 def get_one(
@@ -25,7 +28,7 @@ def get_one(
     db: Session = Depends(get_db),
     ignore_not_found_exception: bool = False,
 ):
-    query = db.query(curation_model.Curation).filter(curation_model.Curation.id == id)
+    query = get_curation_query_base(db).filter(curation_model.Curation.id == id)
     curation = None
     if check_if_manager_user(current_user):
         curation = query.first()
@@ -62,6 +65,8 @@ def create(req_body: curation_schemas.CreateCuration, db: Session = Depends(get_
     db.add(new_curation)
     db.commit()
     db.refresh(new_curation)
+    curation_document_repository.render([new_curation.id], db)
+    catalog_cache.invalidate_curations()
     return new_curation
 
 
@@ -81,3 +86,5 @@ def update(id, update_data: dict, db: Session = Depends(get_db)):
             setattr(curation, key, value)
     setattr(curation, "updated_at", datetime.utcnow())
     db.commit()
+    curation_document_repository.render([id], db)
+    catalog_cache.invalidate_curations()
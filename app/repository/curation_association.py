@@ -7,7 +7,9 @@ from ..database.models import (
 )
 from ..schemas import curation as curation
 from ..database.base import get_db
+from ..helpers import catalog_cache
 from ..repository import book as book_repository
+from . import curation_document as curation_document_repository
 
 
 def create_multiple(
@@ -37,11 +39,21 @@ def create_multiple(
 
     db.add_all(new_associations)
     db.commit()
+    curation_document_repository.render([curation_id], db)
+    catalog_cache.invalidate_curations()
 
 
 def destroy_multiple(ids: List[str], db: Session = Depends(get_db)):
     associations = db.query(
         book_curation_association_model.BookCurationAssociation
     ).filter(book_curation_association_model.BookCurationAssociation.id.in_(ids))
+    curation_ids = [
+        association.curation_id
+        for association in associations.with_entities(
+            book_curation_association_model.BookCurationAssociation.curation_id
+        )
+    ]
     associations.delete(synchronize_session=False)
     db.commit()
+    curation_document_repository.render(curation_ids, db)
+    catalog_cache.invalidate_curations()
@@ -0,0 +1,218 @@
+from datetime import datetime
+from typing import Iterable, List
+from fastapi import Depends, HTTPException, status
+from pydantic import TypeAdapter
+from sqlalchemy import or_, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+
+from ..database.base import get_async_db, get_db
+from ..database.models import book as book_models
+from ..database.models import (
+    book_curation_association as book_curation_association_model,
+)
+from ..database.models import book_genre_association as book_genre_association_model
+from ..database.models import curation as curation_model
+from ..database.models import curation_document as curation_document_model
+from ..helpers.pagination import paginate_async
+from ..schemas import curation as curation_schemas
+from ..utils.constants import CURATION_DOCUMENT_VERSION
+
+curation_public_adapter = TypeAdapter(curation_schemas.ShowCuration)
+curation_private_adapter = TypeAdapter(curation_schemas.ShowCurationPrivate)
+
+
+def build(curation_ids: Iterable[str], db: Session = Depends(get_db)):
+    curation_ids = list(set(curation_ids))
+    if not curation_ids:
+        return []
+    curations = (
+        db.query(curation_model.Curation)
+        .options(
+            selectinload(curation_model.Curation.curation_associations)
+            .selectinload(book_curation_association_model.BookCurationAssociation.book)
+            .selectinload(book_models.Book.genre_associations)
+            .selectinload(book_genre_association_model.BookGenreAssociation.genre)
+        )
+        .filter(curation_model.Curation.id.in_(curation_ids))
+        .all()
+    )
+
+    now = datetime.utcnow()
+    documents = []
+    for curation in curations:
+        content = {
+            **curation.__dict__,
+            # associations whose book was deleted are left out of the document
+            "curation_associations": [
+                association
+                for association in curation.curation_associations
+                if association.book is not None
+            ],
+        }
+        private_document = curation_private_adapter.dump_json(
+            curation_private_adapter.validate_python(content)
+        )
+        public_document = (
+            curation_public_adapter.dump_json(
+                curation_public_adapter.validate_python(content)
+            )
+            if curation.published
+            else None
+        )
+        documents.append(
+            {
+                "curation_id": curation.id,
+                "public_document": public_document and public_document.decode(),
+                "private_document": private_document.decode(),
+                "schema_version": CURATION_DOCUMENT_VERSION,
+                "updated_at": now,
+            }
+        )
+    return documents
+
+
+def render(curation_ids: Iterable[str], db: Session = Depends(get_db)):
+    documents = build(curation_ids, db)
+    if documents:
+        statement = sqlite_insert(curation_document_model.CurationDocument)
+        db.execute(
+            statement.on_conflict_do_update(
+                index_elements=[curation_document_model.CurationDocument.curation_id],
+                set_={
+                    "public_document": statement.excluded.public_document,
+                    "private_document": statement.excluded.private_document,
+                    "schema_version": statement.excluded.schema_version,
+                    "updated_at": statement.excluded.updated_at,
+                },
+            ),
+            documents,
+        )
+        db.commit()
+    return {document["curation_id"]: document for document in documents}
+
+
+def render_for_books(book_ids: Iterable[str], db: Session = Depends(get_db)):
+    association = book_curation_association_model.BookCurationAssociation
+    curation_ids = db.scalars(
+        select(association.curation_id)
+        .where(association.book_id.in_(list(book_ids)))
+        .distinct()
+    ).all()
+    render(curation_ids, db)
+
+
+def render_for_genre(genre_id: str, db: Session = Depends(get_db)):
+    association = book_curation_association_model.BookCurationAssociation
+    genre_association = book_genre_association_model.BookGenreAssociation
+    curation_ids = db.scalars(
+        select(association.curation_id)
+        .join(genre_association, genre_association.book_id == association.book_id)
+        .where(genre_association.genre_id == genre_id)
+        .distinct()
+    ).all()
+    render(curation_ids, db)
+
+
+def render_stale(db: Session = Depends(get_db)):
+    document = curation_document_model.CurationDocument
+    curation_ids = db.scalars(
+        select(curation_model.Curation.id)
+        .outerjoin(document, document.curation_id == curation_model.Curation.id)
+        .where(
+            or_(
+                document.curation_id.is_(None),
+                document.schema_version != CURATION_DOCUMENT_VERSION,
+            )
+        )
+    ).all()
+    render(curation_ids, db)
+    return len(curation_ids)
+
+
+def get_document_column(is_manager_user: bool):
+    return (
+        curation_document_model.CurationDocument.private_document
+        if is_manager_user
+        else curation_document_model.CurationDocument.public_document
+    )
+
+
+def get_document_statement(id: str, is_manager_user: bool):
+    statement = select(get_document_column(is_manager_user)).filter(
+        curation_document_model.CurationDocument.curation_id == id
+    )
+    if not is_manager_user:
+        statement = statement.join(
+            curation_model.Curation,
+            curation_model.Curation.id
+            == curation_document_model.CurationDocument.curation_id,
+        ).filter(curation_model.Curation.published == True)
+    return statement
+
+
+async def get_one_async(
+    id: str, is_manager_user: bool, db: AsyncSession = Depends(get_async_db)
+) -> str:
+    document = await db.scalar(get_document_statement(id, is_manager_user))
+    if document is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=f"curation {id} not available"
+        )
+    return document
+
+
+def get_documents_statement(is_manager_user: bool):
+    statement = (
+        select(
+            curation_model.Curation.id,
+            curation_model.Curation.updated_at,
+            get_document_column(is_manager_user).label("document"),
+        )
+        .outerjoin(
+            curation_document_model.CurationDocument,
+            curation_document_model.CurationDocument.curation_id
+            == curation_model.Curation.id,
+        )
+        .order_by(
+            curation_model.Curation.updated_at.desc(),
+            curation_model.Curation.id.desc(),
+        )
+    )
+    if not is_manager_user:
+        statement = statement.filter(curation_model.Curation.published == True)
+    return statement
+
+
+def get_row_documents(rows, rendered: dict, is_manager_user: bool) -> List[str]:
+    document_key = "private_document" if is_manager_user else "public_document"
+    return [
+        row.document if row.document is not None else rendered[row.id][document_key]
+        for row in rows
+    ]
+
+
+async def get_all_async(
+    is_manager_user: bool,
+    db: AsyncSession = Depends(get_async_db),
+    cursor: str | None = None,
+    limit: int | None = None,
+) -> tuple[List[str], str | None]:
+    rows, next_cursor = await paginate_async(
+        db,
+        get_documents_statement(is_manager_user),
+        [curation_model.Curation.updated_at, curation_model.Curation.id],
+        lambda row: [row.updated_at, row.id],
+        cursor,
+        limit,
+    )
+    # built but not stored, this path may run on a read-only connection
+    missing_ids = [row.id for row in rows if row.document is None]
+    documents = (
+        await db.run_sync(lambda session: build(missing_ids, session))
+        if missing_ids
+        else []
+    )
+    rendered = {document["curation_id"]: document for document in documents}
+    return get_row_documents(rows, rendered, is_manager_user), next_cursor
@@ -4,6 +4,9 @@ from sqlalchemy.orm import Session
 from ..database.models import genre as genre_model
 from ..schemas import genre as genre_schemas
 from ..database.base import get_db
+from ..helpers import catalog_cache
+from ..helpers.suggestion_index import suggestion_index
+from . import curation_document as curation_document_repository
 from datetime import datetime
 
 
@@ -45,7 +48,9 @@ def create(req_body: genre_schemas.CreateGenre, db: Session = Depends(get_db)):
     )
     db.add(new_genre)
     db.commit()
+    catalog_cache.invalidate_genres()
     db.refresh(new_genre)
+    suggestion_index.set_genre(new_genre.id, new_genre.name)
     return new_genre
 
 
@@ -63,3 +68,6 @@ def update(id, update_data: dict, db: Session = Depends(get_db)):
             setattr(genre, key, value)
     setattr(genre, "updated_at", datetime.utcnow())
     db.commit()
+    suggestion_index.set_genre(genre.id, genre.name)
+    curation_document_repository.render_for_genre(id, db)
+    catalog_cache.invalidate_genres()
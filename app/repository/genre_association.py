@@ -5,7 +5,11 @@ from sqlalchemy.orm import Session
 from ..database.models import book_genre_association as book_genre_association_model
 from ..schemas import genre as genre
 from ..database.base import get_db
+from ..helpers import catalog_cache
+from ..helpers.genre_index import genre_index
+from ..helpers.suggestion_index import suggestion_index
 from ..repository import genre as genre_repository
+from . import curation_document as curation_document_repository
 from ..utils.constants import MAX_BOOK_GENRES_ASSOCIATIONS
 
 
@@ -22,7 +26,7 @@ def create_multiple(
 
     existing_genre_ids = set(assoc.genre_id for assoc in existing_associations)
 
-    
+    new_associations = []
     if len(existing_associations) + len(genre_ids) <= MAX_BOOK_GENRES_ASSOCIATIONS:
         # raise HTTPException(
         #     status_code=status.HTTP_400_BAD_REQUEST,
@@ -31,7 +35,6 @@ def create_multiple(
         valid_genre_ids = set(
             genre_id for genre_id in genre_ids if genre_repository.get_one(genre_id, db, True)
         )
-        new_associations = []
         for genre_id in valid_genre_ids:
             if genre_id not in existing_genre_ids:
                 new_association = book_genre_association_model.BookGenreAssociation(
@@ -41,11 +44,39 @@ def create_multiple(
 
     db.add_all(new_associations)
     db.commit()
+    added_associations = [
+        (association.book_id, association.genre_id)
+        for association in new_associations
+    ]
+    genre_index.add(added_associations)
+    suggestion_index.add_associations(added_associations)
+    if added_associations:
+        curation_document_repository.render_for_books([book_id], db)
+    catalog_cache.invalidate_book_details()
 
 
 def destroy_multiple(ids: List[str], db: Session = Depends(get_db)):
     associations = db.query(book_genre_association_model.BookGenreAssociation).filter(
         book_genre_association_model.BookGenreAssociation.id.in_(ids)
     )
+    removed_associations = associations.with_entities(
+        book_genre_association_model.BookGenreAssociation.book_id,
+        book_genre_association_model.BookGenreAssociation.genre_id,
+    ).all()
     associations.delete(synchronize_session=False)
     db.commit()
+    genre_index.remove(removed_associations)
+    suggestion_index.remove_associations(removed_associations)
+    curation_document_repository.render_for_books(
+        set(association.book_id for association in removed_associations), db
+    )
+    catalog_cache.invalidate_book_details()
+
+
+def load_genre_index(db: Session = Depends(get_db)):
+    genre_index.build(
+        db.query(
+            book_genre_association_model.BookGenreAssociation.book_id,
+            book_genre_association_model.BookGenreAssociation.genre_id,
+        ).all()
+    )
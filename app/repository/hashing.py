@@ -1,5 +1,16 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Deque, Dict
+
+from fastapi import HTTPException, status
 from passlib.context import CryptContext
 
+from ..utils.constants import HASH_LATENCY_SAMPLE_SIZE, HASH_POOL_SIZE, HASH_QUEUE_LIMIT
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
@@ -8,3 +19,110 @@ def verify_hash(plain_text, hashed_text):
 
 def create_hash(plain_text: str):
     return pwd_context.hash(plain_text)
+
+
+class LatencyMetrics:
+    def __init__(self, sample_size: int):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self._samples: Deque[float] = deque(maxlen=sample_size)
+
+    def record(self, duration_ms: float):
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+        self._samples.append(duration_ms)
+
+    def summary(self):
+        samples = sorted(self._samples)
+
+        def percentile(value: float):
+            if not samples:
+                return 0.0
+            return samples[min(len(samples) - 1, int(len(samples) * value))]
+
+        return {
+            "count": self.count,
+            "mean_ms": self.total_ms / self.count if self.count else 0.0,
+            "p50_ms": percentile(0.5),
+            "p95_ms": percentile(0.95),
+            "max_ms": self.max_ms,
+        }
+
+
+class HashingService:
+    def __init__(self, pool_size: int, queue_limit: int):
+        self.pool_size = pool_size
+        self.queue_limit = queue_limit
+        self.in_flight = 0
+        self.rejected = 0
+        self.latencies: Dict[str, LatencyMetrics] = {
+            "hash": LatencyMetrics(HASH_LATENCY_SAMPLE_SIZE),
+            "verify": LatencyMetrics(HASH_LATENCY_SAMPLE_SIZE),
+        }
+        self._pool: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    async def hash(self, plain_text: str) -> str:
+        return await self._run("hash", create_hash, plain_text)
+
+    async def verify(self, plain_text: str, hashed_text: str) -> bool:
+        return await self._run("verify", verify_hash, plain_text, hashed_text)
+
+    def get_metrics(self):
+        with self._lock:
+            return {
+                "pool_size": self.pool_size,
+                "queue_limit": self.queue_limit,
+                "in_flight": self.in_flight,
+                "rejected": self.rejected,
+                **{
+                    operation: latency.summary()
+                    for operation, latency in self.latencies.items()
+                },
+            }
+
+    def shutdown(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    async def _run(self, operation: str, function: Callable, *args):
+        self._admit()
+        started_at = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._get_pool(), function, *args
+            )
+        finally:
+            duration_ms = (time.perf_counter() - started_at) * 1000
+            with self._lock:
+                self.in_flight -= 1
+                self.latencies[operation].record(duration_ms)
+
+    def _admit(self):
+        with self._lock:
+            if self.in_flight >= self.pool_size + self.queue_limit:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="too many password checks in progress, retry shortly",
+                    headers={"Retry-After": "1"},
+                )
+            self.in_flight += 1
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # started on first use so startup stays fast, and spawned
+                # rather than forked from a process that is running threads
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.pool_size,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._pool
+
+
+hashing_service = HashingService(pool_size=HASH_POOL_SIZE, queue_limit=HASH_QUEUE_LIMIT)
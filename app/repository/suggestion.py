@@ -0,0 +1,49 @@
+from fastapi import Depends
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..database.base import get_db
+from ..database.models import book as book_models
+from ..database.models import book_genre_association as book_genre_association_model
+from ..database.models import check_in_out as check_in_out_models
+from ..database.models import genre as genre_model
+from ..helpers.suggestion_index import suggestion_index
+
+
+def load_suggestion_index(db: Session = Depends(get_db)):
+    borrow_counts = (
+        db.query(
+            check_in_out_models.CheckInOut.book_id,
+            func.count(check_in_out_models.CheckInOut.id).label("borrow_count"),
+        )
+        .group_by(check_in_out_models.CheckInOut.book_id)
+        .subquery()
+    )
+    books = (
+        db.query(
+            book_models.Book.id,
+            book_models.Book.title,
+            book_models.Book.author_name,
+            book_models.Book.public_shelf_quantity > 0,
+            func.coalesce(borrow_counts.c.borrow_count, 0),
+        )
+        .join(
+            borrow_counts,
+            borrow_counts.c.book_id == book_models.Book.id,
+            isouter=True,
+        )
+        .all()
+    )
+    genres = db.query(genre_model.Genre.id, genre_model.Genre.name).all()
+    associations = db.query(
+        book_genre_association_model.BookGenreAssociation.book_id,
+        book_genre_association_model.BookGenreAssociation.genre_id,
+    ).all()
+    suggestion_index.build(books, genres, associations)
+
+
+def get_suggestions(prefix: str, limit: int):
+    return [
+        {"text": text, "kind": kind, "weight": weight}
+        for text, kind, weight in suggestion_index.suggest(prefix, limit)
+    ]
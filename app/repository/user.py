@@ -1,12 +1,17 @@
 from datetime import datetime, timedelta
 from fastapi import Depends, HTTPException, status
 
-from ..database.base import get_db
+from ..database.base import get_async_db, get_db
 from ..schemas import user as user_schemas
+from ..database.models import role as role_models
 from ..database.models import user as user_models
 from ..database.models import user_role_association as user_role_association_models
 
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from ..helpers.pagination import paginate
+from ..helpers.principal_cache import invalidate_user
 from .hashing import create_hash
 
 
@@ -14,11 +19,26 @@ def count_all(db: Session = Depends(get_db)):
     return db.query(user_models.User).count()
 
 
-def get_all(db: Session = Depends(get_db)):
-    users = (
-        db.query(user_models.User).order_by(user_models.User.updated_at.desc()).all()
+def load_user_roles():
+    # batched SELECT ... IN per level, the models' eager joins would wrap the
+    # keyset page in a subquery that SQLite has to sort again
+    return selectinload(user_models.User.user_role_associations).selectinload(
+        user_role_association_models.UserRoleAssociation.role
+    )
+
+
+def get_all(
+    db: Session = Depends(get_db), cursor: str | None = None, limit: int | None = None
+):
+    return paginate(
+        db.query(user_models.User)
+        .options(load_user_roles())
+        .order_by(user_models.User.updated_at.desc(), user_models.User.id.desc()),
+        [user_models.User.updated_at, user_models.User.id],
+        lambda user: [user.updated_at, user.id],
+        cursor,
+        limit,
     )
-    return users
 
 
 def get_one(
@@ -33,6 +53,56 @@ def get_one(
     return user
 
 
+async def get_one_async(
+    id,
+    db: AsyncSession = Depends(get_async_db),
+    ignore_not_found_exception: bool = False,
+):
+    statement = select(user_models.User).filter(user_models.User.id == id)
+    result = await db.execute(statement)
+    # the eager joins on role associations repeat the user row
+    user = result.unique().scalars().first()
+    if not user and not ignore_not_found_exception:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=f"user {id} not available"
+        )
+    return user
+
+
+async def get_role_names_async(
+    id, db: AsyncSession = Depends(get_async_db)
+) -> list[str] | None:
+    # columns only, so none of the eager role and permission graph is loaded
+    association = user_role_association_models.UserRoleAssociation
+    statement = (
+        select(role_models.Role.name)
+        .select_from(user_models.User)
+        .outerjoin(association, association.user_id == user_models.User.id)
+        .outerjoin(role_models.Role, role_models.Role.id == association.role_id)
+        .filter(user_models.User.id == id)
+    )
+    names = (await db.scalars(statement)).all()
+    if not names:
+        return None
+    return [name for name in names if name is not None]
+
+
+async def get_auth_version_async(
+    id, db: AsyncSession = Depends(get_async_db)
+) -> int | None:
+    return await db.scalar(
+        select(user_models.User.auth_version).filter(user_models.User.id == id)
+    )
+
+
+def bump_auth_version(id, db: Session = Depends(get_db)):
+    # revokes every token issued to the user, committed by the caller
+    db.query(user_models.User).filter(user_models.User.id == id).update(
+        {user_models.User.auth_version: user_models.User.auth_version + 1},
+        synchronize_session=False,
+    )
+
+
 def get_one_by_email(
     email, db: Session = Depends(get_db), ignore_not_found_exception: bool = False
 ):
@@ -45,12 +115,17 @@ def get_one_by_email(
     return user
 
 
-def create(req_body: user_schemas.UserSignUp, db: Session = Depends(get_db)):
+def create(
+    req_body: user_schemas.UserSignUp,
+    db: Session = Depends(get_db),
+    password_hash: str | None = None,
+):
+    # routes hash through hashing_service first, the seeders hash inline
     new_user = user_models.User(
         first_name=req_body.first_name,
         last_name=req_body.last_name,
         email=req_body.email,
-        password=create_hash(req_body.password),
+        password=password_hash or create_hash(req_body.password),
     )
     db.add(new_user)
     db.commit()
@@ -71,7 +146,10 @@ def update(id, update_data: dict, db: Session = Depends(get_db)):
                 continue
             setattr(user, key, value)
     setattr(user, "updated_at", datetime.utcnow())
+    if update_data.get("password") is not None:
+        user.auth_version = user_models.User.auth_version + 1
     db.commit()
+    invalidate_user(id)
 
 
 def destroy(id, db: Session = Depends(get_db)):
@@ -82,17 +160,18 @@ def destroy(id, db: Session = Depends(get_db)):
         )
     user.delete(synchronize_session=False)
     db.commit()
+    invalidate_user(id)
 
 
 def save_auth_code(
-    id: str, code_col_name: str, code: str, db: Session = Depends(get_db)
+    id: str, code_col_name: str, code_hash: str, db: Session = Depends(get_db)
 ):
     user = db.query(user_models.User).get(id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail=f"user {id} not available"
         )
-    setattr(user, code_col_name, create_hash(code))
+    setattr(user, code_col_name, code_hash)
     setattr(user, code_col_name + "_last_generated_at", datetime.utcnow())
     setattr(user, "updated_at", datetime.utcnow())
     db.commit()
@@ -141,7 +220,9 @@ def create_user_role_association(
         role_id=data.role_id,
     )
     db.add(new_user_role_association)
+    bump_auth_version(data.user_id, db)
     db.commit()
+    invalidate_user(data.user_id)
     db.refresh(new_user_role_association)
     return new_user_role_association
 
@@ -150,9 +231,13 @@ def destroy_user_role_association(id, db: Session = Depends(get_db)):
     role = db.query(user_role_association_models.UserRoleAssociation).filter(
         user_role_association_models.UserRoleAssociation.id == id
     )
-    if not role.first():
+    user_role_association = role.first()
+    if not user_role_association:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail=f"role {id} not available"
         )
+    user_id = user_role_association.user_id
     role.delete(synchronize_session=False)
+    bump_auth_version(user_id, db)
     db.commit()
+    invalidate_user(user_id)
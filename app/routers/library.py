@@ -1,13 +1,45 @@
 from datetime import datetime, timedelta
-from typing import Any, List, Union
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+from typing import List, Union
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.responses import StreamingResponse
 
-from app.database.enums import BorrowStatusFilter
+from app.database.enums import (
+    BorrowStatusFilter,
+    CatalogFileFormat,
+    GenreMatchFilter,
+    SearchMode,
+)
 from app.database.models.check_in_out import CheckInOut
-from app.database.models.curation import Curation
+from app.helpers import catalog_cache
+from app.helpers.catalog_file import read_csv, read_ndjson, to_csv, to_ndjson
 from app.helpers.email_templates import get_book_due_soon_email, get_book_late_email
+from app.helpers.etag import (
+    is_not_modified,
+    make_etag,
+    not_modified_response,
+    set_cache_headers,
+)
+from app.helpers import responses
 from app.helpers.send_email import send_email_background
-from app.utils.constants import DUE_DAYS_REMINDER_AT, MAX_BOOK_GENRES_ASSOCIATIONS
+from app.utils.constants import (
+    DEFAULT_PAGE_LIMIT,
+    DUE_DAYS_REMINDER_AT,
+    MAX_BOOK_GENRES_ASSOCIATIONS,
+    MAX_PAGE_LIMIT,
+    PRIVATE_CACHE_CONTROL,
+    PUBLIC_CACHE_CONTROL,
+    SUGGESTION_TOP_K,
+)
 from ..repository import genre_association as genre_association_repository
 from ..schemas import book as book_schemas
 from ..schemas import generic as generic_schemas
@@ -15,12 +47,15 @@ from ..schemas import genre as genre_schemas
 from ..schemas import curation as curation_schemas
 from ..repository import book as book_repository
 from ..repository import check_in_out as check_in_out_repository
+from ..repository import suggestion as suggestion_repository
 from ..repository import genre as genre_repository
 from ..repository import curation as curation_repository
+from ..repository import curation_document as curation_document_repository
 from ..repository import user as user_repository
 from ..repository import curation_association as curation_association_repository
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from ..database.base import get_db
+from ..database.base import ReadSessionLocal, get_async_read_db, get_db, get_read_db
 from ..repository import authentication as authentication_repository
 from ..schemas import check_in_out as check_in_out_schemas
 
@@ -33,10 +68,58 @@ router = APIRouter(prefix="/library/books", tags=["Library"])
     response_model=book_schemas.ShowBooksPublicResponse,
     status_code=status.HTTP_200_OK,
 )
-def view_books(db: Session = Depends(get_db), genres: str | None = None):
-    books = book_repository.get_all(None, genres.split(",") if genres else None, db)
-    data = {"message": "success", "data": books}
-    return data
+async def view_books(
+    request: Request,
+    db: AsyncSession = Depends(get_async_read_db),
+    genres: str | None = None,
+    genre_match: GenreMatchFilter = Query(
+        GenreMatchFilter.ANY, description="Match books in any or all of the genres"
+    ),
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    facets: bool = Query(
+        False, description="Include genre, availability & shelf counts of all matches"
+    ),
+    fields: str | None = Query(
+        None, description="Return only these book fields, separated by comma ','"
+    ),
+):
+    genre_ids = genres.split(",") if genres else None
+    book_fields = book_repository.parse_fields(fields)
+    cache_key = (
+        tuple(sorted(genre_ids)) if genre_ids else None,
+        genre_match,
+        cursor,
+        limit,
+        facets,
+        tuple(sorted(book_fields)) if book_fields else None,
+    )
+    etag = make_etag("books", catalog_cache.books_cache.version, cache_key)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag, PUBLIC_CACHE_CONTROL)
+
+    async def load_books():
+        books, next_cursor, book_facets = await book_repository.get_all_async(
+            None, genre_ids, db, cursor, limit, genre_match, facets, book_fields
+        )
+        data = {
+            "message": "success",
+            "data": books,
+            "next_cursor": next_cursor,
+            "facets": book_facets,
+        }
+        if book_fields:
+            return responses.to_json(
+                responses.books_public_fields_adapter, data, exclude_unset=True
+            )
+        return responses.to_json(responses.books_public_adapter, data)
+
+    # the cache holds encoded bodies, hits skip serialization entirely
+    response = responses.json_response(
+        await catalog_cache.books_cache.get_or_load_async(cache_key, load_books)
+    )
+    set_cache_headers(response, etag, PUBLIC_CACHE_CONTROL)
+    return response
 
 
 @router.get(
@@ -46,20 +129,20 @@ def view_books(db: Session = Depends(get_db), genres: str | None = None):
     ],
     status_code=status.HTTP_200_OK,
 )
-def view_book(
+async def view_book(
     id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user=Depends(authentication_repository.get_current_user_or_none),
 ):
-    book = book_repository.get_one(id, current_user, db)
-    response = {"message": "success", "data": book}
+    book = await book_repository.get_one_async(id, current_user, db)
+    data = {"message": "success", "data": book}
 
-    data = (
-        book_schemas.ShowBookPrivateResponse(**response)
+    adapter = (
+        responses.book_private_adapter
         if authentication_repository.check_if_manager_user(current_user)
-        else book_schemas.ShowBookPublicResponse(**response)
+        else responses.book_public_adapter
     )
-    return data.dict()
+    return responses.serialize(adapter, data)
 
 
 @router.get(
@@ -68,15 +151,70 @@ def view_book(
     status_code=status.HTTP_200_OK,
 )
 def view_books_as_manager(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user=Depends(authentication_repository.get_current_manager_user),
     genres: str | None = None,
+    genre_match: GenreMatchFilter = Query(
+        GenreMatchFilter.ANY, description="Match books in any or all of the genres"
+    ),
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    facets: bool = Query(
+        False, description="Include genre, availability & shelf counts of all matches"
+    ),
+    fields: str | None = Query(
+        None, description="Return only these book fields, separated by comma ','"
+    ),
 ):
-    books = book_repository.get_all(
-        current_user, genres.split(",") if genres else None, db
+    book_fields = book_repository.parse_fields(fields, is_manager=True)
+    books, next_cursor, book_facets = book_repository.get_all(
+        current_user,
+        genres.split(",") if genres else None,
+        db,
+        cursor,
+        limit,
+        genre_match,
+        facets,
+        book_fields,
+    )
+    data = {
+        "message": "success",
+        "data": books,
+        "next_cursor": next_cursor,
+        "facets": book_facets,
+    }
+    if book_fields:
+        return responses.serialize(
+            responses.books_private_fields_adapter, data, exclude_unset=True
+        )
+    return responses.serialize(responses.books_private_adapter, data)
+
+
+@router.get("/export", status_code=status.HTTP_200_OK)
+def export_books(
+    current_user=Depends(authentication_repository.get_current_manager_user),
+    format: CatalogFileFormat = Query(CatalogFileFormat.NDJSON),
+):
+    def stream_books():
+        # the request's session may be closed before streaming finishes
+        db = ReadSessionLocal()
+        try:
+            rows = book_repository.get_export_rows(db)
+            if format == CatalogFileFormat.CSV:
+                yield from to_csv(rows, book_repository.EXPORT_COLUMNS)
+            else:
+                yield from to_ndjson(rows)
+        finally:
+            db.close()
+
+    media_type = "text/csv" if format == CatalogFileFormat.CSV else "application/x-ndjson"
+    return StreamingResponse(
+        stream_books(),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="books.{format.value}"'
+        },
     )
-    data = {"message": "success", "data": books}
-    return data
 
 
 @router.post(
@@ -108,6 +246,26 @@ def create_book(
     return {"message": "success", "data": created_book}
 
 
+@router.post(
+    "/import",
+    response_model=book_schemas.ImportBooksResponse,
+    status_code=status.HTTP_200_OK,
+)
+def import_books(
+    file: UploadFile,
+    db: Session = Depends(get_db),
+    current_user=Depends(authentication_repository.get_current_proprietor_user),
+    format: CatalogFileFormat = Query(CatalogFileFormat.NDJSON),
+):
+    if format == CatalogFileFormat.CSV:
+        rows = read_csv(file.file)
+    else:
+        rows = read_ndjson(file.file)
+    imported, errors = book_repository.import_books(rows, current_user.id, db)
+    data = {"message": "success", "imported": imported, "errors": errors}
+    return data
+
+
 @router.patch("/", response_model=generic_schemas.NoDataResponse)
 def edit_book_details(
     req_body: book_schemas.EditBookDetails,
@@ -173,18 +331,52 @@ def delete_book(
     status_code=status.HTTP_200_OK,
 )
 def search_for_books(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user=Depends(authentication_repository.get_current_user_or_none),
     query: str = Query(None, description="Search books by title, author & description"),
+    mode: SearchMode = Query(
+        SearchMode.FULL_TEXT,
+        description="Use fuzzy to tolerate typos in titles & author names",
+    ),
     genres: str = Query(
         None, description="Filter books by multiple genre ids separated by comma ',' "
     ),
+    genre_match: GenreMatchFilter = Query(
+        GenreMatchFilter.ANY, description="Match books in any or all of the genres"
+    ),
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    facets: bool = Query(
+        False, description="Include genre, availability & shelf counts of all matches"
+    ),
+    fields: str | None = Query(
+        None, description="Return only these book fields, separated by comma ','"
+    ),
 ):
-    books = book_repository.search(
-        current_user, query, genres.split(",") if genres else None, db
+    book_fields = book_repository.parse_fields(fields)
+    books, next_cursor, book_facets = book_repository.search(
+        current_user,
+        query,
+        genres.split(",") if genres else None,
+        db,
+        cursor,
+        limit,
+        genre_match,
+        mode,
+        facets,
+        book_fields,
     )
-    data = {"message": "success", "data": books}
-    return data
+    data = {
+        "message": "success",
+        "data": books,
+        "next_cursor": next_cursor,
+        "facets": book_facets,
+    }
+    if book_fields:
+        return responses.serialize(
+            responses.books_public_fields_adapter, data, exclude_unset=True
+        )
+    return responses.serialize(responses.books_public_adapter, data)
 
 
 @router.get(
@@ -193,17 +385,65 @@ def search_for_books(
     status_code=status.HTTP_200_OK,
 )
 def search_for_books_as_manager(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user=Depends(authentication_repository.get_current_manager_user),
     query: str = Query(None, description="Search books by title, author & description"),
+    mode: SearchMode = Query(
+        SearchMode.FULL_TEXT,
+        description="Use fuzzy to tolerate typos in titles & author names",
+    ),
     genres: str = Query(
         None, description="Filter books by multiple genre ids separated by comma ',' "
     ),
+    genre_match: GenreMatchFilter = Query(
+        GenreMatchFilter.ANY, description="Match books in any or all of the genres"
+    ),
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    facets: bool = Query(
+        False, description="Include genre, availability & shelf counts of all matches"
+    ),
+    fields: str | None = Query(
+        None, description="Return only these book fields, separated by comma ','"
+    ),
 ):
-    books = book_repository.search(
-        current_user, query, genres.split(",") if genres else None, db
+    book_fields = book_repository.parse_fields(fields, is_manager=True)
+    books, next_cursor, book_facets = book_repository.search(
+        current_user,
+        query,
+        genres.split(",") if genres else None,
+        db,
+        cursor,
+        limit,
+        genre_match,
+        mode,
+        facets,
+        book_fields,
     )
-    data = {"message": "success", "data": books}
+    data = {
+        "message": "success",
+        "data": books,
+        "next_cursor": next_cursor,
+        "facets": book_facets,
+    }
+    if book_fields:
+        return responses.serialize(
+            responses.books_private_fields_adapter, data, exclude_unset=True
+        )
+    return responses.serialize(responses.books_private_adapter, data)
+
+
+@router.get(
+    "/suggest",
+    response_model=book_schemas.SuggestionsResponse,
+    status_code=status.HTTP_200_OK,
+)
+def suggest_books(
+    prefix: str = Query(..., description="Beginning of a title, author or genre"),
+    limit: int = Query(SUGGESTION_TOP_K, ge=1, le=SUGGESTION_TOP_K),
+):
+    suggestions = suggestion_repository.get_suggestions(prefix, limit)
+    data = {"message": "success", "data": suggestions}
     return data
 
 
@@ -249,13 +489,23 @@ def edit_book_quantity(
     return {"message": "success", "detail": "book quantity updated"}
 
 
+@router.patch("/quantity/bulk", response_model=generic_schemas.NoDataResponse)
+def edit_book_quantities(
+    req_body: book_schemas.EditBookQuantities,
+    db: Session = Depends(get_db),
+    current_user=Depends(authentication_repository.get_current_proprietor_user),
+):
+    updated_count = book_repository.update_quantities(req_body.books, db)
+    return {"message": "success", "detail": f"{updated_count} book quantities updated"}
+
+
 @router.get(
     "/borrower",
     response_model=check_in_out_schemas.CheckInOutListResponse,
     status_code=status.HTTP_200_OK,
 )
 def view_borrowed_books(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user=Depends(authentication_repository.get_current_borrower_user),
 ):
     check_in_outs = check_in_out_repository.get_all_by_user(current_user, db)
@@ -269,22 +519,31 @@ def view_borrowed_books(
     status_code=status.HTTP_200_OK,
 )
 def view_borrowed_books_as_manager(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user=Depends(authentication_repository.get_current_librarian_user),
     status: BorrowStatusFilter = Query(None, description="borrow status filter"),
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
 ):
     check_in_outs = []
+    next_cursor = None
 
     if (not status) or status == BorrowStatusFilter.ALL:
-        check_in_outs = check_in_out_repository.get_all(db)
+        check_in_outs, next_cursor = check_in_out_repository.get_all(
+            db, cursor, limit
+        )
     elif status == BorrowStatusFilter.DUE_SOON:
-        check_in_outs = check_in_out_repository.get_all_due_soon_books(
+        check_in_outs, next_cursor = check_in_out_repository.get_all_due_soon_books(
             datetime.utcnow() + timedelta(days=DUE_DAYS_REMINDER_AT),
             db,
+            cursor,
+            limit,
         )
     elif status == BorrowStatusFilter.LATE:
-        check_in_outs = check_in_out_repository.get_all_late_books(db)
-    data = {"message": "success", "data": check_in_outs}
+        check_in_outs, next_cursor = check_in_out_repository.get_all_late_books(
+            db, cursor, limit
+        )
+    data = {"message": "success", "data": check_in_outs, "next_cursor": next_cursor}
     return data
 
 
@@ -391,7 +650,7 @@ def return_book(
     status_code=status.HTTP_200_OK,
 )
 def view_due_soon_and_late_books(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user=Depends(authentication_repository.get_current_borrower_user),
 ):
     due_soon_checkouts: List[CheckInOut] = (
@@ -419,11 +678,20 @@ def view_due_soon_and_late_books(
     status_code=status.HTTP_200_OK,
 )
 def view_genres(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
 ):
-    genres = genre_repository.get_all(db)
-    data = {"message": "success", "data": genres}
-    return data
+    etag = make_etag("genres", catalog_cache.genres_cache.version)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag, PUBLIC_CACHE_CONTROL)
+    set_cache_headers(response, etag, PUBLIC_CACHE_CONTROL)
+
+    def load_genres():
+        genres = genre_repository.get_all(db)
+        return genre_schemas.GetGenresResponse(message="success", data=genres)
+
+    return catalog_cache.genres_cache.get_or_load(None, load_genres)
 
 
 @router.post(
@@ -480,21 +748,26 @@ def edit_genre_details(
     ],
     status_code=status.HTTP_200_OK,
 )
-def view_curation(
+async def view_curation(
     id: str,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_async_read_db),
     current_user=Depends(authentication_repository.get_current_user_or_none),
 ):
-    curation: List[Curation] = curation_repository.get_one(id, current_user, db)
-
-    response: dict[str, Any] = {"message": "success", "data": curation}
+    is_manager_user = authentication_repository.check_if_manager_user(current_user)
+    cache_control = PRIVATE_CACHE_CONTROL if current_user else PUBLIC_CACHE_CONTROL
+    etag = make_etag(
+        "curations", catalog_cache.curations_version.value, (id, is_manager_user)
+    )
+    if is_not_modified(request, etag):
+        return not_modified_response(etag, cache_control)
 
-    data = (
-        curation_schemas.GetCurationPrivateResponse(**response)
-        if authentication_repository.check_if_manager_user(current_user)
-        else curation_schemas.GetCurationPublicResponse(**response)
+    document = await curation_document_repository.get_one_async(
+        id, is_manager_user, db
     )
-    return data
+    response = responses.document_response(document)
+    set_cache_headers(response, etag, cache_control)
+    return response
 
 
 @router.get(
@@ -505,22 +778,29 @@ def view_curation(
     ],
     status_code=status.HTTP_200_OK,
 )
-def view_curations(
-    db: Session = Depends(get_db),
+async def view_curations(
+    request: Request,
+    db: AsyncSession = Depends(get_async_read_db),
     current_user=Depends(authentication_repository.get_current_user_or_none),
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
 ):
-    curations: List[Curation] = curation_repository.get_all(current_user, db)
-
-    curation_dicts = [curation.__dict__ for curation in curations]
-
-    response: dict[str, Any] = {"message": "success", "data": curation_dicts}
+    is_manager_user = authentication_repository.check_if_manager_user(current_user)
+    cache_control = PRIVATE_CACHE_CONTROL if current_user else PUBLIC_CACHE_CONTROL
+    etag = make_etag(
+        "curations",
+        catalog_cache.curations_version.value,
+        (cursor, limit, is_manager_user),
+    )
+    if is_not_modified(request, etag):
+        return not_modified_response(etag, cache_control)
 
-    data = (
-        curation_schemas.GetCurationsPrivateResponse(**response)
-        if authentication_repository.check_if_manager_user(current_user)
-        else curation_schemas.GetCurationsPublicResponse(**response)
+    documents, next_cursor = await curation_document_repository.get_all_async(
+        is_manager_user, db, cursor, limit
     )
-    return data
+    response = responses.documents_response(documents, next_cursor=next_cursor)
+    set_cache_headers(response, etag, cache_control)
+    return response
 
 
 @router.post(
@@ -1,11 +1,13 @@
+import asyncio
 from datetime import datetime
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from ..database.enums import UserRole
 from ..helpers.email_templates import get_reset_password_email, get_verification_email
 from ..helpers.send_email import send_email_background
 
-from ..repository.hashing import create_hash, verify_hash
+from ..repository.hashing import hashing_service
 
 
 from ..repository import user as user_repository
@@ -13,31 +15,23 @@ from ..repository import authentication as authentication_repository
 from ..schemas import user as user_schemas
 from ..schemas import generic as generic_schemas
 from ..schemas import role as role_schemas
-from ..database.base import get_db
+from ..database.base import get_db, get_read_db
 from ..repository import role as role_repository
+from ..utils.constants import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
 
-@router.post(
-    "/sign-up",
-    response_model=user_schemas.ShowUser,
-    status_code=status.HTTP_201_CREATED,
-)
-def create_user(
+def create_borrower(
     req_body: user_schemas.UserSignUp,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    password_hash: str,
+    verification_code_hash: str,
+    db: Session,
 ):
-    db_user = user_repository.get_one_by_email(req_body.email, db, True)
-    if db_user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"user {req_body.email} already exists",
-        )
     created_user = user_repository.create(
         req_body,
         db,
+        password_hash,
     )
     user_role = role_repository.get_one_by_name(UserRole.BORROWER.value, db, True)
     if user_role is not None:
@@ -47,13 +41,44 @@ def create_user(
             ),
             db,
         )
-    verification_code = authentication_repository.generate_auth_code()
     user_repository.save_auth_code(
         created_user.id,
         "verification_code",
-        verification_code,
+        verification_code_hash,
         db,
     )
+    # loaded here so the response is not serialized through a lazy refresh
+    db.refresh(created_user)
+    return created_user
+
+
+@router.post(
+    "/sign-up",
+    response_model=user_schemas.ShowUser,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_user(
+    req_body: user_schemas.UserSignUp,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+):
+    # bcrypt runs on hashing_service's processes, the queries on the threadpool
+    db_user = await run_in_threadpool(
+        user_repository.get_one_by_email, req_body.email, db, True
+    )
+    if db_user:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"user {req_body.email} already exists",
+        )
+    verification_code = authentication_repository.generate_auth_code()
+    password_hash, verification_code_hash = await asyncio.gather(
+        hashing_service.hash(req_body.password),
+        hashing_service.hash(verification_code),
+    )
+    created_user = await run_in_threadpool(
+        create_borrower, req_body, password_hash, verification_code_hash, db
+    )
     send_email_background(
         background_tasks,
         "Welcome",
@@ -64,8 +89,12 @@ def create_user(
 
 
 @router.patch("/verify-email", response_model=generic_schemas.NoDataResponse)
-def verify_email(req_body: user_schemas.UserVerifyEmail, db: Session = Depends(get_db)):
-    existing_user = user_repository.get_one_by_email(req_body.email, db)
+async def verify_email(
+    req_body: user_schemas.UserVerifyEmail, db: Session = Depends(get_db)
+):
+    existing_user = await run_in_threadpool(
+        user_repository.get_one_by_email, req_body.email, db
+    )
     if not (
         existing_user.verification_code
         and existing_user.verification_code_last_generated_at
@@ -84,37 +113,41 @@ def verify_email(req_body: user_schemas.UserVerifyEmail, db: Session = Depends(g
             detail=f"expired verification code",
         )
 
-    if not verify_hash(
+    if not await hashing_service.verify(
         req_body.verification_code,
         existing_user.verification_code,
     ):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail=f"incorrect verification code"
         )
-    user_repository.invalidate_auth_code(
+    await run_in_threadpool(
+        user_repository.invalidate_auth_code,
         existing_user.id,
         "verification_code",
         db,
     )
     update_data = {"is_verified": True, "is_email_verified": True}
-    user_repository.update(existing_user.id, update_data, db)
+    await run_in_threadpool(user_repository.update, existing_user.id, update_data, db)
     return {"message": "success", "detail": "email verified"}
 
 
 @router.post(
     "/resend-verification/email", response_model=generic_schemas.NoDataResponse
 )
-def resend_verification_email(
+async def resend_verification_email(
     req_body: user_schemas.UserResendVerificationEmail,
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
 ):
-    existing_user = user_repository.get_one_by_email(req_body.email, db)
+    existing_user = await run_in_threadpool(
+        user_repository.get_one_by_email, req_body.email, db
+    )
     verification_code = authentication_repository.generate_auth_code()
-    user_repository.save_auth_code(
+    await run_in_threadpool(
+        user_repository.save_auth_code,
         existing_user.id,
         "verification_code",
-        verification_code,
+        await hashing_service.hash(verification_code),
         db,
     )
 
@@ -131,34 +164,40 @@ def resend_verification_email(
     "/login",
     response_model=user_schemas.UserLoginResponse,
 )
-def login(
+async def login(
     req_body: user_schemas.UserLoginCredentials,
     db: Session = Depends(get_db),
 ):
-    user = user_repository.get_one_by_email(req_body.email, db)
-    if not verify_hash(
+    user = await run_in_threadpool(user_repository.get_one_by_email, req_body.email, db)
+    if not await hashing_service.verify(
         req_body.password,
         user.password,
     ):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail=f"incorrect credentials"
         )
-    access_token = authentication_repository.create_access_token(data={"id": user.id})
+    access_token = authentication_repository.create_access_token(
+        data={"id": user.id},
+        claims=authentication_repository.get_token_claims(user),
+    )
     return {"access_token": access_token, "user": user}
 
 
 @router.patch("/forgot-password", response_model=generic_schemas.NoDataResponse)
-def forgot_password(
+async def forgot_password(
     req_body: user_schemas.UserForgotPassword,
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
 ):
-    existing_user = user_repository.get_one_by_email(req_body.email, db)
+    existing_user = await run_in_threadpool(
+        user_repository.get_one_by_email, req_body.email, db
+    )
     reset_password_code = authentication_repository.generate_auth_code()
-    user_repository.save_auth_code(
+    await run_in_threadpool(
+        user_repository.save_auth_code,
         existing_user.id,
         "reset_password_code",
-        reset_password_code,
+        await hashing_service.hash(reset_password_code),
         db,
     )
 
@@ -172,10 +211,12 @@ def forgot_password(
 
 
 @router.patch("/reset-password", response_model=generic_schemas.NoDataResponse)
-def reset_password(
+async def reset_password(
     req_body: user_schemas.UserResetPassword, db: Session = Depends(get_db)
 ):
-    existing_user = user_repository.get_one_by_email(req_body.email, db)
+    existing_user = await run_in_threadpool(
+        user_repository.get_one_by_email, req_body.email, db
+    )
     if not (
         existing_user.reset_password_code
         and existing_user.reset_password_code_last_generated_at
@@ -194,7 +235,7 @@ def reset_password(
             detail=f"expired reset password code",
         )
 
-    if not verify_hash(
+    if not await hashing_service.verify(
         req_body.code,
         existing_user.reset_password_code,
     ):
@@ -202,32 +243,33 @@ def reset_password(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=f"incorrect reset password code",
         )
-    user_repository.invalidate_auth_code(
+    await run_in_threadpool(
+        user_repository.invalidate_auth_code,
         existing_user.id,
         "reset_password_code",
         db,
     )
     update_data = {
-        "password": create_hash(req_body.password),
+        "password": await hashing_service.hash(req_body.password),
     }
-    user_repository.update(existing_user.id, update_data, db)
+    await run_in_threadpool(user_repository.update, existing_user.id, update_data, db)
     return {"message": "success", "detail": "password reset"}
 
 
 @router.patch("/change-password", response_model=generic_schemas.NoDataResponse)
-def change_password(
+async def change_password(
     req_body: user_schemas.UserChangePassword,
     db: Session = Depends(get_db),
     current_user=Depends(authentication_repository.get_current_user),
 ):
-    if not verify_hash(
+    if not await hashing_service.verify(
         req_body.current_password,
         current_user.password,
     ):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail=f"incorrect password"
         )
-    if verify_hash(
+    if await hashing_service.verify(
         req_body.new_password,
         current_user.password,
     ):
@@ -236,9 +278,9 @@ def change_password(
             detail=f"new password cannot be same as old password",
         )
     update_data = {
-        "password": create_hash(req_body.new_password),
+        "password": await hashing_service.hash(req_body.new_password),
     }
-    user_repository.update(current_user.id, update_data, db)
+    await run_in_threadpool(user_repository.update, current_user.id, update_data, db)
     return {"message": "success", "detail": "password changed"}
 
 
@@ -270,7 +312,7 @@ def edit_profile(
     status_code=status.HTTP_200_OK,
 )
 def view_roles(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user=Depends(authentication_repository.get_current_librarian_user),
 ):
     roles = role_repository.get_all_by_librarian(db)
@@ -331,8 +373,21 @@ def regulate_manager(
     status_code=status.HTTP_200_OK,
 )
 def view_all_users(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
+    current_user=Depends(authentication_repository.get_current_librarian_user),
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+):
+    users, next_cursor = user_repository.get_all(db, cursor, limit)
+    return {"message": "success", "data": users, "next_cursor": next_cursor}
+
+
+@router.get(
+    "/hashing/metrics",
+    response_model=user_schemas.HashingMetricsResponse,
+    status_code=status.HTTP_200_OK,
+)
+def view_hashing_metrics(
     current_user=Depends(authentication_repository.get_current_librarian_user),
 ):
-    users = user_repository.get_all(db)
-    return {"message": "success", "data": users}
+    return {"message": "success", "data": hashing_service.get_metrics()}
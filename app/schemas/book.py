@@ -1,9 +1,19 @@
 from datetime import datetime
 from typing import Annotated, List, Optional
-from annotated_types import Ge
-from pydantic import BaseModel, ConfigDict, HttpUrl, root_validator
-
+from annotated_types import Ge, Len
+from pydantic import (
+    AliasChoices,
+    BaseModel,
+    ConfigDict,
+    Field,
+    HttpUrl,
+    field_validator,
+    root_validator,
+)
+
+from app.database.enums import SuggestionKind
 from app.schemas.genre import BookGenreAssociation
+from app.utils.constants import MAX_BULK_QUANTITY_UPDATES
 
 
 class NoExtraBaseModel(BaseModel):
@@ -24,6 +34,35 @@ class CreateBook(NoExtraBaseModel):
     genre_ids: Optional[List[str]] = []
 
 
+class ImportBook(IgnoreExtraBaseModel):
+    title: str
+    author_name: str
+    description: Optional[str] = None
+    img_url: HttpUrl
+    public_shelf_quantity: Annotated[int, Ge(0)]
+    private_shelf_quantity: Annotated[int, Ge(0)]
+    # genre ids or names, exported catalogs use genre_ids
+    genres: List[str] = Field([], validation_alias=AliasChoices("genres", "genre_ids"))
+
+    @field_validator("genres", mode="before")
+    @classmethod
+    def split_genres(cls, value):
+        if isinstance(value, str):
+            return [genre.strip() for genre in value.split(";") if genre.strip()]
+        return value
+
+
+class ImportBookError(BaseModel):
+    row: int
+    detail: str
+
+
+class ImportBooksResponse(BaseModel):
+    message: str
+    imported: int
+    errors: List[ImportBookError]
+
+
 class Book(CreateBook):
     id: str
     proprietor_id: str
@@ -35,7 +74,7 @@ class ShowBook(IgnoreExtraBaseModel):
     id: str
     title: str
     author_name: str
-    description: str
+    description: Optional[str] = None
     img_url: HttpUrl
     created_at: datetime
     updated_at: datetime
@@ -50,6 +89,23 @@ class ShowBookPublicWithBorrowCount(ShowBookPublic):
     current_borrow_count: Optional[int] = 0
 
 
+class GenreFacet(BaseModel):
+    genre_id: str
+    count: int
+
+
+class BookFacetsPublic(BaseModel):
+    genres: List[GenreFacet]
+    total: int
+    available: int
+    fully_borrowed: int
+
+
+class BookFacetsPrivate(BookFacetsPublic):
+    public_shelf: int
+    private_shelf: int
+
+
 class ShowBookPublicResponse(IgnoreExtraBaseModel):
     message: str
     data: ShowBookPublicWithBorrowCount
@@ -58,6 +114,28 @@ class ShowBookPublicResponse(IgnoreExtraBaseModel):
 class ShowBooksPublicResponse(IgnoreExtraBaseModel):
     message: str
     data: List[ShowBookPublicWithBorrowCount]
+    next_cursor: Optional[str] = None
+    facets: Optional[BookFacetsPublic] = None
+
+
+class ShowBookPublicFields(IgnoreExtraBaseModel):
+    id: str
+    title: Optional[str] = None
+    author_name: Optional[str] = None
+    description: Optional[str] = None
+    img_url: Optional[HttpUrl] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    genre_associations: Optional[List[BookGenreAssociation]] = None
+    public_shelf_quantity: Optional[int] = None
+    current_borrow_count: Optional[int] = None
+
+
+class ShowBooksPublicFieldsResponse(IgnoreExtraBaseModel):
+    message: str
+    data: List[ShowBookPublicFields]
+    next_cursor: Optional[str] = None
+    facets: Optional[BookFacetsPublic] = None
 
 
 class ShowBookPrivate(ShowBook):
@@ -79,6 +157,32 @@ class ShowBookPrivateResponse(IgnoreExtraBaseModel):
 class ShowBooksPrivateResponse(IgnoreExtraBaseModel):
     message: str
     data: List[ShowBookPrivateWithBorrowCount]
+    next_cursor: Optional[str] = None
+    facets: Optional[BookFacetsPrivate] = None
+
+
+class ShowBookPrivateFields(ShowBookPublicFields):
+    proprietor_id: Optional[str] = None
+    total_quantity: Optional[int] = None
+    private_shelf_quantity: Optional[int] = None
+
+
+class ShowBooksPrivateFieldsResponse(IgnoreExtraBaseModel):
+    message: str
+    data: List[ShowBookPrivateFields]
+    next_cursor: Optional[str] = None
+    facets: Optional[BookFacetsPrivate] = None
+
+
+class Suggestion(BaseModel):
+    text: str
+    kind: SuggestionKind
+    weight: int
+
+
+class SuggestionsResponse(BaseModel):
+    message: str
+    data: List[Suggestion]
 
 
 class EditBookDetails(NoExtraBaseModel):
@@ -104,3 +208,7 @@ class EditBookQuantity(NoExtraBaseModel):
                 "either public_shelf_quantity or private_shelf_quantity is required"
             )
         return values
+
+
+class EditBookQuantities(NoExtraBaseModel):
+    books: Annotated[List[EditBookQuantity], Len(1, MAX_BULK_QUANTITY_UPDATES)]
@@ -36,6 +36,7 @@ class CheckInOutResponse(NoExtraBaseModel):
 class CheckInOutListResponse(NoExtraBaseModel):
     message: str
     data: List[ShowCheckInOut]
+    next_cursor: Optional[str] = None
 
 
 class ReturnBook(NoExtraBaseModel):
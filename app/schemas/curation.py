@@ -60,8 +60,10 @@ class GetCurationPrivateResponse(IgnoreExtraBaseModel):
 class GetCurationsPublicResponse(IgnoreExtraBaseModel):
     message: str
     data: List[ShowCuration]
+    next_cursor: Optional[str] = None
 
 
 class GetCurationsPrivateResponse(IgnoreExtraBaseModel):
     message: str
     data: List[ShowCurationPrivate]
+    next_cursor: Optional[str] = None
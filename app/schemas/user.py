@@ -119,3 +119,26 @@ class AddOrRemoveManagerUser(NoExtraBaseModel):
 class ViewAllUsers(NoExtraBaseModel):
     message: str
     data: List[AdminUserViewProfileData] = []
+    next_cursor: Optional[str] = None
+
+
+class HashOperationMetrics(NoExtraBaseModel):
+    count: int
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    max_ms: float
+
+
+class HashingMetrics(NoExtraBaseModel):
+    pool_size: int
+    queue_limit: int
+    in_flight: int
+    rejected: int
+    hash: HashOperationMetrics
+    verify: HashOperationMetrics
+
+
+class HashingMetricsResponse(NoExtraBaseModel):
+    message: str
+    data: HashingMetrics
@@ -1,3 +1,62 @@
+import os
+
 MAX_BOOK_GENRES_ASSOCIATIONS = 5
 
 DUE_DAYS_REMINDER_AT = 30
+
+DEFAULT_PAGE_LIMIT = 50
+
+MAX_PAGE_LIMIT = 200
+
+PUBLIC_CATALOG_CACHE_SIZE = 256
+
+PRINCIPAL_CACHE_SIZE = 10_000
+
+# bounds how long another worker's principals and auth versions can lag a role
+# change or password reset
+PRINCIPAL_CACHE_TTL_SECONDS = 60
+
+PUBLIC_CACHE_CONTROL = "public, max-age=30"
+
+PRIVATE_CACHE_CONTROL = "private, no-cache"
+
+FUZZY_SEARCH_CANDIDATE_LIMIT = 200
+
+FUZZY_SEARCH_SIMILARITY_THRESHOLD = 0.3
+
+SUGGESTION_TOP_K = 10
+
+SUGGESTION_MAX_KEY_LENGTH = 40
+
+# trie nodes stop here, longer prefixes are matched among the deepest node's terms
+SUGGESTION_TRIE_DEPTH = 8
+
+EXPORT_BATCH_SIZE = 500
+
+IMPORT_CHUNK_SIZE = 500
+
+MAX_BULK_QUANTITY_UPDATES = 1000
+
+# bump when ShowCuration changes so stored curation documents are re-rendered
+CURATION_DOCUMENT_VERSION = 1
+
+SQLITE_READER_POOL_SIZE = 20
+
+SQLITE_WRITER_POOL_SIZE = 1
+
+SQLITE_WRITER_MAX_OVERFLOW = 3
+
+SQLITE_BUSY_TIMEOUT_MS = 5000
+
+SQLITE_MMAP_SIZE = 256 * 1024 * 1024
+
+# negative sizes are in KiB rather than pages
+SQLITE_CACHE_SIZE = -64 * 1024
+
+# bcrypt is CPU bound, so more workers than cores only adds queueing
+HASH_POOL_SIZE = min(4, os.cpu_count() or 1)
+
+# hashes allowed to wait for a worker before requests are turned away with 503
+HASH_QUEUE_LIMIT = 32
+
+HASH_LATENCY_SAMPLE_SIZE = 1024
@@ -0,0 +1,117 @@
+"""Per-item cost of serializing book responses, before and after TypeAdapters.
+
+    python -m benchmarks.serialization [--books 200] [--rounds 50]
+"""
+import argparse
+import json
+import time
+import uuid
+from datetime import datetime
+from functools import cache
+
+from pydantic import TypeAdapter
+
+from app.helpers import responses
+from app.schemas import book as book_schemas
+
+
+def make_book(index: int):
+    now = datetime.utcnow()
+    return {
+        "id": str(uuid.uuid4()),
+        "proprietor_id": str(uuid.uuid4()),
+        "title": f"Book {index}",
+        "author_name": f"Author {index % 40}",
+        "description": "A description of the book. " * 8,
+        "img_url": f"https://picsum.photos/{200 + index % 500}",
+        "total_quantity": 12,
+        "public_shelf_quantity": 10,
+        "private_shelf_quantity": 2,
+        "current_borrow_count": index % 3,
+        "created_at": now,
+        "updated_at": now,
+        "genre_associations": [
+            {
+                "book_id": "book",
+                "genre_id": f"genre-{genre}",
+                "genre": {
+                    "id": f"genre-{genre}",
+                    "name": f"Genre {genre}",
+                    "description": "A genre",
+                    "created_at": now,
+                    "updated_at": now,
+                },
+            }
+            for genre in range(3)
+        ],
+    }
+
+
+@cache
+def get_adapter(model):
+    return TypeAdapter(model)
+
+
+def fastapi_response_model(model, content):
+    # what a route returning content with response_model=model used to cost:
+    # FastAPI validates it, dumps it in json mode, then json.dumps the result
+    adapter = get_adapter(model)
+    value = adapter.validate_python(content)
+    return json.dumps(adapter.dump_python(value, mode="json")).encode()
+
+
+def view_book_before(book):
+    content = book_schemas.ShowBookPrivateResponse(message="success", data=book)
+    return fastapi_response_model(book_schemas.ShowBookPrivateResponse, content.model_dump())
+
+
+def view_book_after(book):
+    return responses.to_json(
+        responses.book_private_adapter, {"message": "success", "data": book}
+    )
+
+
+def view_books_before(books):
+    return fastapi_response_model(
+        book_schemas.ShowBooksPrivateResponse, {"message": "success", "data": books}
+    )
+
+
+def view_books_after(books):
+    return responses.to_json(
+        responses.books_private_adapter, {"message": "success", "data": books}
+    )
+
+
+def measure(function, content, rounds: int, items: int):
+    function(content)
+    started_at = time.perf_counter()
+    for _ in range(rounds):
+        function(content)
+    return (time.perf_counter() - started_at) / (rounds * items) * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--books", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    books = [make_book(index) for index in range(args.books)]
+    cases = [
+        ("view_book", view_book_before, view_book_after, books[0], 1),
+        ("list", view_books_before, view_books_after, books, len(books)),
+    ]
+    print(f"{'endpoint':<12}{'before µs/item':>16}{'after µs/item':>16}{'speedup':>10}")
+    for name, before, after, content, items in cases:
+        rounds = args.rounds * (len(books) if items == 1 else 1)
+        before_cost = measure(before, content, rounds, items)
+        after_cost = measure(after, content, rounds, items)
+        print(
+            f"{name:<12}{before_cost:>16.1f}{after_cost:>16.1f}"
+            f"{before_cost / after_cost:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Concurrent catalog reads and checkout-style writes against each engine profile.
+
+    python -m benchmarks.sqlite_profiles [--readers 8] [--writers 2] [--seconds 5]
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.database.enums import DatabaseProfile
+from app.database.profile import create_engines
+
+READ_PAGE = text(
+    "SELECT id, title, public_shelf_quantity FROM book "
+    "ORDER BY updated_at DESC, id DESC LIMIT 50"
+)
+UPDATE_BOOK = text(
+    "UPDATE book SET public_shelf_quantity = public_shelf_quantity - 1, "
+    "updated_at = :updated_at WHERE id = :id"
+)
+INSERT_CHECKOUT = text(
+    "INSERT INTO check_in_out (book_id, checked_out_at) VALUES (:id, :updated_at)"
+)
+
+
+def create_schema(engine, books: int):
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "CREATE TABLE book (id INTEGER PRIMARY KEY, title TEXT, "
+                "public_shelf_quantity INTEGER, updated_at TEXT)"
+            )
+        )
+        connection.execute(text("CREATE INDEX ix_book_updated_at ON book (updated_at)"))
+        connection.execute(
+            text(
+                "CREATE TABLE check_in_out (id INTEGER PRIMARY KEY, book_id INTEGER, "
+                "checked_out_at TEXT)"
+            )
+        )
+        now = datetime.utcnow().isoformat()
+        connection.execute(
+            text(
+                "INSERT INTO book (id, title, public_shelf_quantity, updated_at) "
+                "VALUES (:id, :title, 1000000, :updated_at)"
+            ),
+            [
+                {"id": index, "title": f"Book {index}", "updated_at": now}
+                for index in range(books)
+            ],
+        )
+
+
+def run_profile(profile: DatabaseProfile, args: argparse.Namespace):
+    directory = tempfile.mkdtemp()
+    engine, read_engine = create_engines(
+        os.path.join(directory, "benchmark.db"), profile
+    )
+    create_schema(engine, args.books)
+
+    stop = threading.Event()
+    read_latencies, write_latencies = [], []
+    locked_errors = [0]
+    lock = threading.Lock()
+
+    def read():
+        while not stop.is_set():
+            started_at = time.perf_counter()
+            try:
+                with read_engine.connect() as connection:
+                    connection.execute(READ_PAGE).all()
+            except OperationalError:
+                with lock:
+                    locked_errors[0] += 1
+                continue
+            with lock:
+                read_latencies.append(time.perf_counter() - started_at)
+
+    def write():
+        while not stop.is_set():
+            values = {
+                "id": random.randrange(args.books),
+                "updated_at": datetime.utcnow().isoformat(),
+            }
+            started_at = time.perf_counter()
+            try:
+                with engine.begin() as connection:
+                    connection.execute(UPDATE_BOOK, values)
+                    connection.execute(INSERT_CHECKOUT, values)
+            except OperationalError:
+                with lock:
+                    locked_errors[0] += 1
+                continue
+            with lock:
+                write_latencies.append(time.perf_counter() - started_at)
+
+    threads = [threading.Thread(target=read) for _ in range(args.readers)] + [
+        threading.Thread(target=write) for _ in range(args.writers)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+    read_engine.dispose()
+
+    def p95(latencies):
+        if len(latencies) < 2:
+            return 0.0
+        return statistics.quantiles(latencies, n=20)[-1] * 1000
+
+    return (
+        len(read_latencies) / args.seconds,
+        p95(read_latencies),
+        len(write_latencies) / args.seconds,
+        p95(write_latencies),
+        locked_errors[0],
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--books", type=int, default=5000)
+    args = parser.parse_args()
+
+    print(
+        f"{'profile':<12}{'reads/s':>10}{'read p95 ms':>13}"
+        f"{'writes/s':>10}{'write p95 ms':>14}{'locked':>8}"
+    )
+    for profile in DatabaseProfile:
+        reads, read_p95, writes, write_p95, locked = run_profile(profile, args)
+        print(
+            f"{profile.value:<12}{reads:>10.0f}{read_p95:>13.1f}"
+            f"{writes:>10.0f}{write_p95:>14.1f}{locked:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
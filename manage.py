@@ -0,0 +1,76 @@
+import argparse
+from dotenv import load_dotenv
+
+load_dotenv(".env")
+
+
+def migrate(args: argparse.Namespace):
+    from app.database.base import engine
+    from app.database.migrations import migrate as apply_migrations
+
+    applied = apply_migrations(engine, args.to)
+    for migration in applied:
+        print(f"applied {migration.version}: {migration.description}")
+    if not applied:
+        print("schema is up to date")
+
+
+def schema_version(args: argparse.Namespace):
+    from app.database.base import engine
+    from app.database.migrations import LATEST_VERSION, get_pending, get_version
+
+    with engine.connect() as connection:
+        version = get_version(connection)
+    print(f"schema version {version} of {LATEST_VERSION}")
+    for migration in get_pending(version):
+        print(f"pending {migration.version}: {migration.description}")
+
+
+def seed(args: argparse.Namespace):
+    from app import main  # noqa: F401 registers every model
+    from app.config.seed import seed as seed_defaults
+
+    seed_defaults()
+    print("seeded default roles, users, genres and books")
+
+
+def reconcile_borrow_counts(args: argparse.Namespace):
+    from app import main  # noqa: F401 registers every model
+    from app.database.base import SessionLocal
+    from app.repository import book_availability as book_availability_repository
+
+    db = SessionLocal()
+    try:
+        count = book_availability_repository.reconcile(db)
+    finally:
+        db.close()
+    print(f"reconciled borrow counts for {count} books")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bibliotheque-E management commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    migrate_parser = commands.add_parser(
+        "migrate", help="apply pending schema migrations"
+    )
+    migrate_parser.add_argument(
+        "--to", type=int, default=None, help="stop at this schema version"
+    )
+    migrate_parser.set_defaults(handler=migrate)
+
+    commands.add_parser(
+        "schema-version", help="show the applied and pending schema migrations"
+    ).set_defaults(handler=schema_version)
+
+    commands.add_parser(
+        "seed", help="create the default roles, users, genres and books"
+    ).set_defaults(handler=seed)
+
+    commands.add_parser(
+        "reconcile-borrow-counts",
+        help="recompute every book's borrowed count from check_in_out",
+    ).set_defaults(handler=reconcile_borrow_counts)
+
+    args = parser.parse_args()
+    args.handler(args)
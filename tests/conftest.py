@@ -0,0 +1,149 @@
+import os
+import shutil
+import tempfile
+from typing import List, NamedTuple
+
+# the engines are created when app is imported, so this has to come first
+DATABASE_DIRECTORY = tempfile.mkdtemp()
+os.environ["DATABASE_PATH"] = os.path.join(DATABASE_DIRECTORY, "test.db")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("MAIL_FROM", "library@example.com")
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.config.users import create_default_roles_and_permissions
+from app.database.base import (
+    SessionLocal,
+    async_engine,
+    async_read_engine,
+    engine,
+    read_engine,
+)
+from app.database.enums import UserRole
+from app.database.migrations import migrate
+from app.main import app
+from app.repository import authentication as authentication_repository
+from app.repository import check_in_out as check_in_out_repository
+from app.repository import role as role_repository
+from app.repository import user as user_repository
+from app.schemas import check_in_out as check_in_out_schemas
+from app.schemas import user as user_schemas
+
+BOOK_COUNT = 12
+
+
+class Seed(NamedTuple):
+    headers: dict
+    book_ids: List[str]
+    genre_ids: List[str]
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args):
+        self.count += 1
+
+
+def create_user(email: str, role_names: List[str], db):
+    # the hash is never checked, tokens are issued directly
+    user = user_repository.create(
+        user_schemas.UserSignUp(
+            first_name="Test", last_name="User", email=email, password="unused"
+        ),
+        db,
+        "unused",
+    )
+    for role_name in role_names:
+        role = role_repository.get_one_by_name(role_name, db)
+        user_repository.create_user_role_association(
+            user_schemas.CreateUserRoleAssociation(user_id=user.id, role_id=role.id),
+            db,
+        )
+    return user_repository.get_one(user.id, db)
+
+
+def get_headers(user):
+    token = authentication_repository.create_access_token(
+        data={"id": user.id},
+        claims=authentication_repository.get_token_claims(user),
+    )
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture(scope="session")
+def client():
+    return TestClient(app)
+
+
+@pytest.fixture(scope="session")
+def seed(client):
+    migrate(engine)
+    create_default_roles_and_permissions()
+    db = SessionLocal()
+    try:
+        librarian = create_user(
+            "librarian@example.com",
+            [UserRole.LIBRARIAN.value, UserRole.PROPRIETOR.value],
+            db,
+        )
+        headers = get_headers(librarian)
+        for index in range(3):
+            client.post(
+                "/library/books/genres",
+                headers=headers,
+                json={"name": f"genre {index}", "description": "test genre"},
+            )
+        genre_ids = [
+            genre["id"] for genre in client.get("/library/books/genres").json()["data"]
+        ]
+        book_ids = [
+            client.post(
+                "/library/books/",
+                headers=headers,
+                json={
+                    "title": f"Book {index}",
+                    "author_name": f"Author {index}",
+                    "description": "test book",
+                    "img_url": "https://example.com/cover.png",
+                    "public_shelf_quantity": 2,
+                    "private_shelf_quantity": 1,
+                    "genre_ids": genre_ids[: 1 + index % 3],
+                },
+            ).json()["data"]["id"]
+            for index in range(BOOK_COUNT)
+        ]
+        # one open check-out per borrower, so every row has its own borrower
+        for index, book_id in enumerate(book_ids):
+            borrower = create_user(
+                f"borrower{index}@example.com", [UserRole.BORROWER.value], db
+            )
+            check_in_out_repository.check_out_book(
+                check_in_out_schemas.CreateCheckInOut(book_id=book_id),
+                borrower.id,
+                db,
+            )
+    finally:
+        db.close()
+    yield Seed(headers, book_ids, genre_ids)
+    shutil.rmtree(DATABASE_DIRECTORY, ignore_errors=True)
+
+
+@pytest.fixture
+def count_queries():
+    counter = QueryCounter()
+    engines = [
+        engine,
+        read_engine,
+        async_engine.sync_engine,
+        async_read_engine.sync_engine,
+    ]
+    for counted_engine in engines:
+        event.listen(counted_engine, "before_cursor_execute", counter)
+    yield counter
+    for counted_engine in engines:
+        event.remove(counted_engine, "before_cursor_execute", counter)
@@ -0,0 +1,225 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.database.base import SessionLocal
+from app.database.enums import UserRole
+from app.database.models import check_in_out as check_in_out_models
+from app.helpers import catalog_cache
+from app.repository import check_in_out as check_in_out_repository
+from app.repository import curation_document as curation_document_repository
+from app.schemas import check_in_out as check_in_out_schemas
+
+from .conftest import create_user, get_headers
+
+SMALL_CURATION_SIZE = 2
+
+SMALL_PAGE_LIMIT = 2
+
+DUE_SOON_DAYS = 10
+
+
+@pytest.fixture(scope="module")
+def curation_ids(client, seed):
+    # created small then large, so the large one is first in the listing
+    for size in (SMALL_CURATION_SIZE, len(seed.book_ids)):
+        client.post(
+            "/library/books/curations",
+            headers=seed.headers,
+            json={
+                "title": f"{size} books",
+                "description": "test curation",
+                "published": True,
+                "book_ids": seed.book_ids[:size],
+            },
+        )
+    curations = client.get("/library/books/curations", headers=seed.headers).json()
+    return {
+        len(curation["curation_associations"]): curation["id"]
+        for curation in curations["data"]
+    }
+
+
+@pytest.fixture(scope="module")
+def reader_headers(seed):
+    # one reader with a single check-out and one with a copy of every book,
+    # all of them due soon
+    db = SessionLocal()
+    try:
+        headers = {}
+        for size in (1, len(seed.book_ids)):
+            reader = create_user(
+                f"reader{size}@example.com", [UserRole.BORROWER.value], db
+            )
+            for book_id in seed.book_ids[:size]:
+                check_in_out_repository.check_out_book(
+                    check_in_out_schemas.CreateCheckInOut(book_id=book_id),
+                    reader.id,
+                    db,
+                )
+            db.query(check_in_out_models.CheckInOut).filter_by(
+                borrower_id=reader.id
+            ).update({"due_at": datetime.utcnow() + timedelta(days=DUE_SOON_DAYS)})
+            db.commit()
+            headers[size] = get_headers(reader)
+    finally:
+        db.close()
+    return headers
+
+
+def count_statements(client, count_queries, url: str, **kwargs) -> int:
+    # warmed first so token misses are not counted, then the public catalog
+    # cache is dropped so the queries behind it are
+    client.get(url, **kwargs)
+    catalog_cache.invalidate_books()
+    count_queries.count = 0
+    response = client.get(url, **kwargs)
+    assert response.status_code == 200
+    return count_queries.count
+
+
+def count_page_statements(client, seed, count_queries, url: str, **kwargs):
+    params = kwargs.pop("params", {})
+    counts = []
+    for limit in (SMALL_PAGE_LIMIT, len(seed.book_ids)):
+        page_params = {**params, "limit": limit}
+        page = client.get(url, params=page_params, **kwargs).json()
+        assert len(page["data"]) == limit
+        counts.append(
+            count_statements(client, count_queries, url, params=page_params, **kwargs)
+        )
+    return counts
+
+
+def test_curation_document_render_queries_do_not_grow_with_books(
+    seed, curation_ids, count_queries
+):
+    db = SessionLocal()
+    try:
+        counts = []
+        for size in (SMALL_CURATION_SIZE, len(seed.book_ids)):
+            count_queries.count = 0
+            curation_document_repository.render([curation_ids[size]], db)
+            counts.append(count_queries.count)
+    finally:
+        db.close()
+    assert counts[0] == counts[1]
+
+
+def test_stored_curation_document_queries_do_not_grow_with_books(
+    client, seed, curation_ids, count_queries
+):
+    # the detail route reads the document rendered on write, not the books
+    small_count, large_count = [
+        count_statements(
+            client,
+            count_queries,
+            f"/library/books/curations/{curation_ids[size]}",
+            headers=seed.headers,
+        )
+        for size in (SMALL_CURATION_SIZE, len(seed.book_ids))
+    ]
+    assert small_count == large_count
+
+
+def test_stored_curation_document_page_queries_do_not_grow_with_books(
+    client, seed, curation_ids, count_queries
+):
+    first_page = client.get(
+        "/library/books/curations", headers=seed.headers, params={"limit": 1}
+    ).json()
+    assert len(first_page["data"][0]["curation_associations"]) == len(seed.book_ids)
+
+    large_count = count_statements(
+        client,
+        count_queries,
+        "/library/books/curations",
+        headers=seed.headers,
+        params={"limit": 1},
+    )
+    small_count = count_statements(
+        client,
+        count_queries,
+        "/library/books/curations",
+        headers=seed.headers,
+        params={"limit": 1, "cursor": first_page["next_cursor"]},
+    )
+    assert small_count == large_count
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {},
+        {"facets": "true"},
+        {"fields": "title,genre_associations,current_borrow_count"},
+    ],
+)
+def test_book_page_queries_do_not_grow_with_page_size(
+    client, seed, count_queries, params
+):
+    small_count, large_count = count_page_statements(
+        client, seed, count_queries, "/library/books/", params=params
+    )
+    assert small_count == large_count
+
+
+def test_manager_book_page_queries_do_not_grow_with_page_size(
+    client, seed, count_queries
+):
+    small_count, large_count = count_page_statements(
+        client, seed, count_queries, "/library/books/manager", headers=seed.headers
+    )
+    assert small_count == large_count
+
+
+@pytest.mark.parametrize(
+    "url, params",
+    [
+        ("/library/books/search", {"query": "book"}),
+        ("/library/books/search", {"query": "book", "facets": "true"}),
+        ("/library/books/search/manager", {"query": "book"}),
+    ],
+)
+def test_search_queries_do_not_grow_with_page_size(
+    client, seed, count_queries, url, params
+):
+    small_count, large_count = count_page_statements(
+        client, seed, count_queries, url, headers=seed.headers, params=params
+    )
+    assert small_count == large_count
+
+
+@pytest.mark.parametrize(
+    "url", ["/library/books/borrower", "/library/books/borrower/reminders"]
+)
+def test_borrower_check_out_queries_do_not_grow_with_check_outs(
+    client, seed, reader_headers, count_queries, url
+):
+    small_count, large_count = [
+        count_statements(client, count_queries, url, headers=reader_headers[size])
+        for size in (1, len(seed.book_ids))
+    ]
+    assert small_count == large_count
+
+
+@pytest.mark.parametrize("status", [None, "due-soon"])
+def test_borrowed_books_queries_do_not_grow_with_page_size(
+    client, seed, reader_headers, count_queries, status
+):
+    small_count, large_count = count_page_statements(
+        client,
+        seed,
+        count_queries,
+        "/library/books/borrower/manager",
+        headers=seed.headers,
+        params={"status": status} if status else {},
+    )
+    assert small_count == large_count
+
+
+def test_user_page_queries_do_not_grow_with_page_size(client, seed, count_queries):
+    small_count, large_count = count_page_statements(
+        client, seed, count_queries, "/users/all", headers=seed.headers
+    )
+    assert small_count == large_count
@@ -0,0 +1,263 @@
+import asyncio
+import re
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Callable, List
+
+import pytest
+from sqlalchemy import event
+
+from app.database.base import (
+    AsyncReadSessionLocal,
+    SessionLocal,
+    async_read_engine,
+    engine,
+)
+from app.database.enums import UserRole
+from app.helpers.principal_cache import Principal
+from app.repository import book as book_repository
+from app.repository import check_in_out as check_in_out_repository
+from app.repository import curation as curation_repository
+from app.repository import curation_document as curation_document_repository
+from app.repository import user as user_repository
+
+# a plain "SCAN <table>" reads every row, "SCAN <table> USING INDEX" walks an
+# index in order and stops at the page limit
+FULL_SCAN = re.compile(r"^SCAN \w+$")
+
+PAGE_LIMIT = 2
+
+CURATION_TITLE = "query plans"
+
+
+@pytest.fixture(scope="module")
+def db(seed):
+    db = SessionLocal()
+    yield db
+    db.close()
+
+
+@pytest.fixture(scope="module")
+def manager():
+    return Principal("manager", frozenset({UserRole.LIBRARIAN.value}), True)
+
+
+@pytest.fixture(scope="module")
+def borrower(db):
+    user = user_repository.get_one_by_email("borrower0@example.com", db)
+    return Principal(user.id, frozenset({UserRole.BORROWER.value}), False)
+
+
+@pytest.fixture(scope="module")
+def curation(client, seed):
+    client.post(
+        "/library/books/curations",
+        headers=seed.headers,
+        json={
+            "title": CURATION_TITLE,
+            "description": "test curation",
+            "published": True,
+            "book_ids": seed.book_ids[:3],
+        },
+    )
+
+
+@contextmanager
+def capture_statements():
+    statements = []
+
+    def capture(connection, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    # the async routes run on the read engine
+    engines = [engine, async_read_engine.sync_engine]
+    for captured_engine in engines:
+        event.listen(captured_engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        for captured_engine in engines:
+            event.remove(captured_engine, "before_cursor_execute", capture)
+
+
+def run_async(call: Callable):
+    async def run():
+        async with AsyncReadSessionLocal() as db:
+            return await call(db)
+
+    return asyncio.run(run())
+
+
+def get_plan(call: Callable, table: str) -> List[str]:
+    # the first SELECT reading from the table, as the repository compiled it
+    with capture_statements() as statements:
+        call()
+    pattern = re.compile(rf'^\s*SELECT\b.*?\bFROM "?{table}"?(\s|$)', re.DOTALL)
+    statement, parameters = next(
+        (statement, parameters)
+        for statement, parameters in statements
+        if pattern.match(statement)
+    )
+    with engine.connect() as connection:
+        rows = connection.exec_driver_sql(
+            f"EXPLAIN QUERY PLAN {statement}", parameters
+        ).all()
+    return [row.detail for row in rows]
+
+
+def assert_uses_index(plan: List[str], index: str):
+    assert any(
+        re.search(rf"USING (COVERING )?INDEX {index}\b", detail) for detail in plan
+    ), plan
+    assert not any(FULL_SCAN.match(detail) for detail in plan), plan
+    assert "USE TEMP B-TREE FOR ORDER BY" not in plan, plan
+
+
+def get_cursor(get_page: Callable):
+    return get_page(None)[1]
+
+
+def test_due_soon_pages_use_open_check_out_index(db):
+    due_time = datetime.utcnow() + timedelta(days=60)
+    cursor = get_cursor(
+        lambda cursor: check_in_out_repository.get_all(db, cursor, PAGE_LIMIT)
+    )
+    for page_cursor in (None, cursor):
+        plan = get_plan(
+            lambda: check_in_out_repository.get_all_due_soon_books(
+                due_time, db, page_cursor, PAGE_LIMIT
+            ),
+            "check_in_out",
+        )
+        assert_uses_index(plan, "ix_check_in_out_open_updated_at")
+
+
+def test_late_pages_use_open_check_out_index(db):
+    cursor = get_cursor(
+        lambda cursor: check_in_out_repository.get_all(db, cursor, PAGE_LIMIT)
+    )
+    for page_cursor in (None, cursor):
+        plan = get_plan(
+            lambda: check_in_out_repository.get_all_late_books(
+                db, page_cursor, PAGE_LIMIT
+            ),
+            "check_in_out",
+        )
+        assert_uses_index(plan, "ix_check_in_out_open_updated_at")
+
+
+@pytest.mark.parametrize(
+    "get_check_outs, index",
+    [
+        (
+            lambda user, db: check_in_out_repository.get_all_by_user(user, db),
+            "ix_check_in_out_borrower_id_updated_at",
+        ),
+        (
+            lambda user, db: check_in_out_repository.get_all_check_outs_by_user(
+                user, db
+            ),
+            "ix_check_in_out_borrower_id_updated_at",
+        ),
+        (
+            lambda user, db: check_in_out_repository.get_due_soon_books_by_user(
+                user, datetime.utcnow() + timedelta(days=60), db
+            ),
+            "ix_check_in_out_open_borrower_id_due_at",
+        ),
+        (
+            lambda user, db: check_in_out_repository.get_late_books_by_user(user, db),
+            "ix_check_in_out_open_borrower_id_due_at",
+        ),
+    ],
+)
+def test_borrower_check_outs_use_borrower_index(db, borrower, get_check_outs, index):
+    plan = get_plan(lambda: get_check_outs(borrower, db), "check_in_out")
+    assert_uses_index(plan, index)
+
+
+@pytest.mark.parametrize(
+    "get_page, table, index",
+    [
+        (
+            lambda db, manager, cursor: check_in_out_repository.get_all(
+                db, cursor, PAGE_LIMIT
+            ),
+            "check_in_out",
+            "ix_check_in_out_updated_at",
+        ),
+        (
+            lambda db, manager, cursor: book_repository.get_all(
+                manager, None, db, cursor, PAGE_LIMIT
+            ),
+            "book",
+            "ix_book_updated_at",
+        ),
+        (
+            lambda db, manager, cursor: user_repository.get_all(db, cursor, PAGE_LIMIT),
+            "user",
+            "ix_user_updated_at",
+        ),
+        (
+            lambda db, manager, cursor: run_async(
+                lambda async_db: curation_document_repository.get_all_async(
+                    manager.is_manager_user, async_db, cursor, PAGE_LIMIT
+                )
+            ),
+            "curation",
+            "ix_curation_updated_at",
+        ),
+    ],
+)
+def test_keyset_pages_use_updated_at_index(
+    db, manager, curation, get_page, table, index
+):
+    cursor = get_cursor(lambda cursor: get_page(db, manager, cursor))
+    for page_cursor in (None, cursor):
+        plan = get_plan(lambda: get_page(db, manager, page_cursor), table)
+        assert_uses_index(plan, index)
+
+
+@pytest.mark.parametrize(
+    "load, table, index",
+    [
+        (
+            lambda db, seed, manager: book_repository.get_all(
+                manager, None, db, None, PAGE_LIMIT
+            ),
+            "book_genre_association",
+            "ix_book_genre_association_book_id",
+        ),
+        (
+            lambda db, seed, manager: curation_document_repository.build(
+                [curation_repository.get_one_by_title(CURATION_TITLE, db).id], db
+            ),
+            "book_curation_association",
+            "ix_book_curation_association_curation_id",
+        ),
+        (
+            lambda db, seed, manager: user_repository.get_all(db, None, PAGE_LIMIT),
+            "user_role_association",
+            "ix_user_role_association_user_id",
+        ),
+        (
+            lambda db, seed, manager: curation_document_repository.render_for_books(
+                seed.book_ids[:2], db
+            ),
+            "book_curation_association",
+            "ix_book_curation_association_book_id",
+        ),
+        (
+            lambda db, seed, manager: curation_document_repository.render_for_genre(
+                seed.genre_ids[0], db
+            ),
+            "book_curation_association",
+            "ix_book_genre_association_genre_id_book_id",
+        ),
+    ],
+)
+def test_association_lookups_use_association_indexes(
+    db, seed, manager, curation, load, table, index
+):
+    plan = get_plan(lambda: load(db, seed, manager), table)
+    assert_uses_index(plan, index)